@@ -1,10 +1,16 @@
-from app.model.calendar import Calendar
-from app.view.console import ConsoleView
+import sys
 
 
-def main():
+def main(argv: list[str] | None = None):
+    # Deferred so that one-shot commands only pay for what they use
+    from app.view.console import ConsoleView
+
+    argv = sys.argv[1:] if argv is None else argv
     console = ConsoleView()
-    console.app_loop()
+    if argv:
+        sys.exit(console.run_once(argv))
+    else:
+        console.app_loop()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,16 @@
+from collections import ChainMap
 from dataclasses import dataclass, field
-from datetime import datetime, date, time
-from typing import ClassVar
+from datetime import datetime, date, time, timedelta
+from types import MappingProxyType
+from typing import ClassVar, Mapping
 
 from app.services.util import generate_unique_id, date_lower_than_today_error, event_not_found_error, \
-    reminder_not_found_error, slot_not_available_error
+    reminder_not_found_error, slot_not_available_error, current_date, invalid_time_range_error, \
+    archive_not_configured_error, archive_cutoff_error, archived_date_error
+from app.services.archive import ArchiveService
+from app.services.changefeed import Change, ChangeFeed
+from app.services.instrumentation import instrumented
+from app.services.timezones import UTC_ZONE, get_zone, to_utc, to_local, local_day_slots
 
 
 # TODO: Implement Reminder class here
@@ -23,14 +30,43 @@ class Reminder:
 # TODO: Implement Event class here
 @dataclass
 class Event:
-    def __init__(self, title: str, description: str, date_: date, start_at: time, end_at: time, id: str = None):
+    def __init__(self, title: str, description: str, date_: date, start_at: time, end_at: time, id: str = None,
+                 time_zone: str = UTC_ZONE, end_date: date | None = None):
         self.title: str = title
         self.description: str = description
         self.date_: date = date_
         self.start_at: time = start_at
         self.end_at: time = end_at
+        # Date of end_at, which in UTC can be one or more days after date_
+        self.end_date: date = end_date or date_
         self.reminders: list[Reminder] = []
         self.id: str = generate_unique_id()
+        # Zone the event was scheduled in; a calendar stores date_, start_at, end_at and end_date in UTC
+        self.time_zone: str = time_zone
+
+    def __setstate__(self, state: dict):
+        # Events saved before end_date was stored ran past midnight when their end was not after their start
+        if "end_date" not in state:
+            date_ = state["date_"]
+            state["end_date"] = date_ if state["end_at"] > state["start_at"] else date_ + timedelta(days=1)
+        self.__dict__.update(state)
+
+    def segments(self) -> list[tuple[date, time, time]]:
+        return utc_segments(datetime.combine(self.date_, self.start_at), datetime.combine(self.end_date, self.end_at))
+
+    def in_time_zone(self, time_zone: str) -> "Event":
+        # Copy of an event stored in UTC with its dates and times on the wall clock of the given zone
+        if time_zone == UTC_ZONE:
+            return self
+        start = to_local(time_zone, self.date_, self.start_at)
+        end = to_local(time_zone, self.end_date, self.end_at)
+        event = self.copy()
+        event.date_ = start.date()
+        event.start_at = start.time()
+        event.end_at = end.time()
+        event.end_date = end.date()
+        event.reminders = reminders_in_time_zone(self.reminders, time_zone)
+        return event
 
     def add_reminder(self, date_time: datetime, reminder_type: str = Reminder.EMAIL):
         reminder = Reminder(date_time=date_time, type=reminder_type)
@@ -42,31 +78,61 @@ class Event:
         else:
             reminder_not_found_error()
 
+    def copy(self) -> "Event":
+        # Reminders are never modified in place, so a new list is enough. Copying __dict__ directly is
+        # several times faster than copy.copy, which matters when localizing events in bulk
+        event = Event.__new__(Event)
+        event.__dict__.update(self.__dict__)
+        event.reminders = list(self.reminders)
+        return event
+
     def __str__(self) -> str:
         return f'ID: {self.id} Event title: {self.title} Description: {self.description} Time: {self.start_at} - {self.end_at}'
 
 
+@dataclass
+class ConflictReport:
+    date_: date
+    start_at: time
+    end_at: time
+    event_ids: list[str] = field(default_factory=list)
+    alternatives: list[tuple[date, time, time]] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        lines = [f"Conflicting events: {', '.join(self.event_ids)}"]
+        if self.alternatives:
+            lines.append("Available alternatives:")
+            lines.extend(f"- {date_} {start_at} - {end_at}" for date_, start_at, end_at in self.alternatives)
+        else:
+            lines.append("No available alternatives found")
+        return "\n".join(lines)
+
+
 # TODO: Implement Day class here
 class Day:
+    SLOT_MINUTES: ClassVar[int] = 15
+    SLOTS_PER_DAY: ClassVar[int] = 24 * 60 // SLOT_MINUTES
+    SLOT_TIMES: ClassVar[tuple[time, ...]] = tuple(time(minutes // 60, minutes % 60)
+                                                   for minutes in range(0, 24 * 60, SLOT_MINUTES))
+
     def __init__(self, date_: date):
         self.date_: date = date_
         self.slots: dict[time, str | None] = {}
+        self._init_slots()
 
     def _init_slots(self):
-        pass
+        self.slots = dict.fromkeys(Day.SLOT_TIMES)
 
     def add_event(self, event_id: str, start_at: time, end_at: time):
-        current_time = start_at
-        while current_time < end_at:
-            if self.slots.get(current_time) is not None:
-                slot_not_available_error()
-                return
-            current_time = self._increment_time(current_time)
-
-        current_time = start_at
-        while current_time < end_at:
-            self.slots[current_time] = event_id
-            current_time = self._increment_time(current_time)
+        if self.find_conflicts(start_at, end_at):
+            slot_not_available_error(self.conflict_report(start_at, end_at))
+
+        self.book(event_id, start_at, end_at)
+
+    def book(self, event_id: str, start_at: time, end_at: time):
+        # Writes the slots without checking them; callers find the conflicts first
+        for slot in Day.slots_between(start_at, end_at):
+            self.slots[slot] = event_id
 
     def delete_event(self, event_id: str):
         deleted = False
@@ -78,105 +144,429 @@ class Day:
             event_not_found_error()
 
     def update_event(self, event_id: str, start_at: time, end_at: time):
-        for slot in self.slots:
-            if self.slots[slot] == event_id:
-                self.slots[slot] = None
+        # Check the whole range before writing so a conflict never leaves the event half moved
+        if self.find_conflicts(start_at, end_at, ignore_id=event_id):
+            slot_not_available_error(self.conflict_report(start_at, end_at, ignore_id=event_id))
 
-        for slot in self.slots:
-            if start_at <= slot < end_at:
-                if self.slots[slot]:
-                    slot_not_available_error()
-                else:
-                    self.slots[slot] = event_id
-
-    def _increment_time(self, t: time) -> time:
-        new_minute = t.minute + 15
-        new_hour = t.hour
-        if new_minute == 60:
-            new_minute = 0
-            new_hour += 1
-        return time(new_hour, new_minute)
+        for slot, saved_id in self.slots.items():
+            if saved_id == event_id:
+                self.slots[slot] = None
+        self.book(event_id, start_at, end_at)
+
+    def find_conflicts(self, start_at: time, end_at: time, ignore_id: str | None = None) -> list[str]:
+        conflicts: list[str] = []
+        for slot in Day.slots_between(start_at, end_at):
+            saved_id = self.slots[slot]
+            if saved_id is not None and saved_id != ignore_id and saved_id not in conflicts:
+                conflicts.append(saved_id)
+        return conflicts
+
+    def conflict_report(self, start_at: time, end_at: time, ignore_id: str | None = None) -> ConflictReport:
+        return scan_occupancy(self.date_, list(self.slots.items()), start_at, end_at, ignore_id)
+
+    def copy(self) -> "Day":
+        day = Day.__new__(Day)
+        day.__dict__.update(self.__dict__)
+        day.slots = dict(self.slots)
+        return day
+
+    @staticmethod
+    def slots_between(start_at: time, end_at: time) -> tuple[time, ...]:
+        # Slots starting in [start_at, end_at), found by index instead of scanning the whole day
+        return Day.SLOT_TIMES[Day._slot_index(start_at):Day._slot_index(end_at)]
+
+    @staticmethod
+    def slot_count(start_at: time, end_at: time) -> int:
+        # Number of slots starting in [start_at, end_at)
+        return max(Day._slot_index(end_at) - Day._slot_index(start_at), 0)
+
+    @staticmethod
+    def _slot_index(t: time) -> int:
+        # Index of the first slot starting at or after t
+        minutes = t.hour * 60 + t.minute + (1 if t.second or t.microsecond else 0)
+        return -(-minutes // Day.SLOT_MINUTES)
+
+
+def scan_occupancy(date_: date, occupancy: list[tuple[time, str | None]], start_at: time, end_at: time,
+                   ignore_id: str | None = None) -> ConflictReport:
+    # Single pass over the slots of a day collecting the conflicting ids and every free window of the same length
+    size = max(Day.slot_count(start_at, end_at), 1)
+    report = ConflictReport(date_, start_at, end_at)
+    first = len(occupancy)
+    window_starts: list[int] = []
+    free_run = 0
+    for index, (slot, saved_id) in enumerate(occupancy):
+        busy = saved_id is not None and saved_id != ignore_id
+        if start_at <= slot:
+            first = min(first, index)
+            if busy and slot < end_at and saved_id not in report.event_ids:
+                report.event_ids.append(saved_id)
+        free_run = 0 if busy else free_run + 1
+        if free_run >= size:
+            window_starts.append(index - size + 1)
+
+    window_starts.sort(key=lambda index: (abs(index - first), index))
+    for index in window_starts:
+        window_end = occupancy[index + size][0] if index + size < len(occupancy) else time(23, 59)
+        report.alternatives.append((date_, occupancy[index][0], window_end))
+    return report
+
+
+def utc_segments(start: datetime, end: datetime) -> list[tuple[date, time, time]]:
+    # The part of a UTC range on each UTC date it covers; parts running up to midnight end at time.max
+    segments = []
+    date_, start_at = start.date(), start.time()
+    while date_ < end.date():
+        segments.append((date_, start_at, time.max))
+        date_, start_at = date_ + timedelta(days=1), time(0)
+    segments.append((date_, start_at, end.time()))
+    return segments
+
+
+def reminders_in_time_zone(reminders: list[Reminder], time_zone: str) -> list[Reminder]:
+    if time_zone == UTC_ZONE:
+        return list(reminders)
+    return [Reminder(to_local(time_zone, reminder.date_time.date(), reminder.date_time.time()), reminder.type)
+            for reminder in reminders]
+
+
+def occupancy(days: Mapping[date, Day], date_: date, time_zone: str) -> list[tuple[time, str | None]]:
+    # Slots of a wall-clock day in the given zone with the id of the event booked in each one
+    if time_zone == UTC_ZONE:
+        day = days.get(date_)
+        return list(day.slots.items()) if day else [(slot, None) for slot in Day.SLOT_TIMES]
+    slots = []
+    for local_time, utc_date, utc_time in local_day_slots(time_zone, date_):
+        day = days.get(utc_date)
+        slots.append((local_time, day.slots.get(utc_time) if day else None))
+    return slots
+
+
+def find_events_in_time_zone(events: Mapping[str, Event], start_at: date, end_at: date,
+                             time_zone: str) -> dict[date, list[Event]]:
+    found: dict[date, list[Event]] = {}
+    if time_zone == UTC_ZONE:
+        for event in events.values():
+            if start_at <= event.date_ <= end_at:
+                found.setdefault(event.date_, []).append(event)
+        return found
+
+    # A wall-clock date is at most a day away from the UTC date, so only events near the range are converted
+    earliest, latest = start_at - timedelta(days=1), end_at + timedelta(days=1)
+    for event in events.values():
+        if earliest <= event.date_ <= latest:
+            local_event = event.in_time_zone(time_zone)
+            if start_at <= local_event.date_ <= end_at:
+                found.setdefault(local_event.date_, []).append(local_event)
+    return found
+
+
+def with_archive(days: Mapping[date, Day], events: Mapping[str, Event], archive: ArchiveService | None,
+                 archived_before: date | None, start_at: date,
+                 end_at: date) -> tuple[Mapping[date, Day], Mapping[str, Event]]:
+    # Hot days and events plus the archived ones of the years a query over [start_at, end_at] can reach. Dates
+    # are widened by a day because a wall-clock date can fall on the previous or next UTC date
+    first = start_at - timedelta(days=1)
+    if archive is None or archived_before is None or first >= archived_before:
+        return days, events
+    last = min(end_at + timedelta(days=1), archived_before - timedelta(days=1))
+    segments = [archive.load(year) for year in range(first.year, last.year + 1)]
+    return ChainMap(days, *(segment[0] for segment in segments)), ChainMap(events, *(segment[1] for segment in segments))
 
 
 # TODO: Implement Calendar class here
-class Calendar:
-    def __init__(self):
-        self.events: dict[str, Event] = {}
+class CalendarSnapshot:
+    def __init__(self, days: dict[date, Day], events: dict[str, Event], time_zone: str = UTC_ZONE,
+                 sequence: int = 0, archive: ArchiveService | None = None, archived_before: date | None = None):
+        # The calendar never modifies these dicts, or the objects in them, once they are shared with a snapshot
+        self.days: Mapping[date, Day] = MappingProxyType(days)
+        self.events: Mapping[str, Event] = MappingProxyType(events)
+        self.time_zone: str = time_zone
+        # Sequence number of the last change included, to resume the change feed from
+        self.sequence: int = sequence
+        self.archive: ArchiveService | None = archive
+        self.archived_before: date | None = archived_before
+
+    def find_events(self, start_at: date, end_at: date, time_zone: str | None = None) -> dict[date, list[Event]]:
+        _, events = with_archive(self.days, self.events, self.archive, self.archived_before, start_at, end_at)
+        return find_events_in_time_zone(events, start_at, end_at, time_zone or self.time_zone)
+
+    def find_available_slots(self, date_: date, time_zone: str | None = None) -> list[time]:
+        days, _ = with_archive(self.days, self.events, self.archive, self.archived_before, date_, date_)
+        return [slot for slot, event_id in occupancy(days, date_, time_zone or self.time_zone) if event_id is None]
+
+    def list_reminders(self, event_id: str, time_zone: str | None = None) -> list[Reminder]:
+        event = self.events.get(event_id)
+        if not event:
+            event_not_found_error()
 
-    def add_event(self, title: str, description: str, date_: date, start_at: time, end_at: time):
-        pass
+        return reminders_in_time_zone(event.reminders, time_zone or self.time_zone)
 
-    def add_reminder(self, event_id: str, date_time: datetime, type_: str):
-        pass
 
-    def find_available_slots(self, date_: date) -> list[time]:
-        pass
+class Calendar:
+    def __init__(self, time_zone: str = UTC_ZONE):
+        self.days: dict[date, Day] = {}
+        self.events: dict[str, Event] = {}
+        # Default zone for the dates and times callers pass in and get back
+        self.time_zone: str = UTC_ZONE
+        self.set_time_zone(time_zone)
+        self.changes: ChangeFeed = ChangeFeed()
+        # Cold storage for days and events before archived_before, see archive_before
+        self.archive: ArchiveService | None = None
+        self.archived_before: date | None = None
+        self._init_copy_on_write()
+
+    def set_time_zone(self, time_zone: str):
+        get_zone(time_zone)
+        self.time_zone = time_zone
+
+    def _init_copy_on_write(self):
+        # Copy-on-write bookkeeping: whether the dicts are shared with a snapshot, and the days and events
+        # created or copied since the last snapshot, which can be modified in place
+        self._copy_on_write: bool = False
+        self._shared: bool = False
+        self._owned_days: set[date] = set()
+        self._owned_events: set[str] = set()
+
+    def __getstate__(self) -> dict:
+        # Subscribers and buffered changes are not persisted, only the sequence number to continue from
+        return {"days": self.days, "events": self.events, "time_zone": self.time_zone,
+                "change_sequence": self.changes.last_sequence, "archive": self.archive,
+                "archived_before": self.archived_before}
+
+    def __setstate__(self, state: dict):
+        self.days = state["days"]
+        self.events = state["events"]
+        self.time_zone = state.get("time_zone", UTC_ZONE)
+        self.changes = ChangeFeed(last_sequence=state.get("change_sequence", 0))
+        self.archive = state.get("archive")
+        self.archived_before = state.get("archived_before")
+        self._init_copy_on_write()
+
+    def snapshot(self) -> CalendarSnapshot:
+        self._copy_on_write = True
+        self._shared = True
+        self._owned_days = set()
+        self._owned_events = set()
+        return CalendarSnapshot(self.days, self.events, self.time_zone, self.changes.last_sequence, self.archive,
+                                self.archived_before)
+
+    def _prepare_write(self):
+        if self._shared:
+            self.days = dict(self.days)
+            self.events = dict(self.events)
+            self._shared = False
+
+    def _writable_day(self, date_: date) -> Day:
+        day = self.days.get(date_)
+        if day is None:
+            day = Day(date_)
+        elif not self._copy_on_write or date_ in self._owned_days:
+            return day
+        else:
+            day = day.copy()
+        self.days[date_] = day
+        if self._copy_on_write:
+            self._owned_days.add(date_)
+        return day
 
-    def update_event(self, event_id: str, title: str, description: str, date_: date, start_at: time, end_at: time):
+    def _writable_event(self, event_id: str) -> Event:
         event = self.events[event_id]
+        if not self._copy_on_write or event_id in self._owned_events:
+            return event
+        event = self.events[event_id] = event.copy()
+        self._owned_events.add(event_id)
+        return event
+
+    def _book(self, event: Event):
+        # Callers check the segments with _find_conflicts first
+        for date_, start_at, end_at in event.segments():
+            if Day.slot_count(start_at, end_at):
+                self._writable_day(date_).book(event.id, start_at, end_at)
+
+    def _find_conflicts(self, segments: list[tuple[date, time, time]], ignore_id: str | None = None) -> list[str]:
+        conflicts: list[str] = []
+        for date_, start_at, end_at in segments:
+            day = self.days.get(date_)
+            if day is not None:
+                conflicts.extend(event_id for event_id in day.find_conflicts(start_at, end_at, ignore_id)
+                                 if event_id not in conflicts)
+        return conflicts
+
+    def _unbook(self, event: Event):
+        for date_, _, _ in event.segments():
+            day = self.days.get(date_)
+            if day is not None and event.id in day.slots.values():
+                self._writable_day(date_).delete_event(event.id)
+
+    def _utc_range(self, date_: date, start_at: time, end_at: time, time_zone: str) -> tuple[datetime, datetime]:
+        start = to_utc(time_zone, date_, start_at)
+        end = to_utc(time_zone, date_, end_at)
+        if end <= start:
+            invalid_time_range_error()
+        # Archived days are read-only, and only the hot days are checked for conflicts
+        if self.archived_before is not None and start.date() < self.archived_before:
+            archived_date_error()
+        return start, end
+
+    @instrumented("calendar.add_event")
+    def add_event(self, title: str, description: str, date_: date, start_at: time, end_at: time,
+                  time_zone: str | None = None) -> str:
+        time_zone = time_zone or self.time_zone
+        if date_ < current_date():
+            date_lower_than_today_error()
+        start, end = self._utc_range(date_, start_at, end_at, time_zone)
+        if self._find_conflicts(utc_segments(start, end)):
+            slot_not_available_error(self.check_conflicts(date_, start_at, end_at, time_zone=time_zone))
+
+        self._prepare_write()
+        event = Event(title=title, description=description, date_=start.date(), start_at=start.time(),
+                      end_at=end.time(), time_zone=time_zone, end_date=end.date())
+        # Ids are only 5 characters long, so collisions are likely once a calendar holds thousands of events
+        while event.id in self.events:
+            event.id = generate_unique_id()
+        self._book(event)
+        self.events[event.id] = event
+        if self._copy_on_write:
+            self._owned_events.add(event.id)
+        self.changes.publish(Change.ADD_EVENT, event.id, event.date_)
+        return event.id
+
+    def add_reminder(self, event_id: str, date_time: datetime, type_: str, time_zone: str | None = None):
+        event = self.events.get(event_id)
         if not event:
             event_not_found_error()
 
-        is_new_date = False
-
-        if event.date_ != date_:
-            self.delete_event(event_id)
-            event = Event(title=title, description=description, date_=date_, start_at=start_at, end_at=end_at)
-            event.id = event_id
-            self.events[event_id] = event
-            is_new_date = True
-            if date_ not in self.days:
-                self.days[date_] = Day(date_)
-            day = self.days[date_]
-            day.add_event(event_id, start_at, end_at)
-        else:
-            event.title = title
-            event.description = description
-            event.date_ = date_
-            event.start_at = start_at
-            event.end_at = end_at
-
-        for day in self.days.values():
-            if not is_new_date and event_id in day.slots.values():
-                day.delete_event(event.id)
-                day.update_event(event.id, start_at, end_at)
+        self._prepare_write()
+        date_time = to_utc(time_zone or self.time_zone, date_time.date(), date_time.time())
+        event = self._writable_event(event_id)
+        event.add_reminder(date_time, type_)
+        self.changes.publish(Change.ADD_REMINDER, event_id, event.date_, len(event.reminders) - 1)
+
+    @instrumented("calendar.find_available_slots")
+    def find_available_slots(self, date_: date, time_zone: str | None = None) -> list[time]:
+        days, _ = with_archive(self.days, self.events, self.archive, self.archived_before, date_, date_)
+        return [slot for slot, event_id in occupancy(days, date_, time_zone or self.time_zone) if event_id is None]
+
+    def check_conflicts(self, date_: date, start_at: time, end_at: time, event_id: str | None = None,
+                        max_alternatives: int = 3, days_ahead: int = 7,
+                        time_zone: str | None = None) -> ConflictReport:
+        time_zone = time_zone or self.time_zone
+        start, end = self._utc_range(date_, start_at, end_at, time_zone)
+        report = ConflictReport(date_, start_at, end_at, self._find_conflicts(utc_segments(start, end), event_id))
+        if report.event_ids:
+            report.alternatives = self._find_alternatives(date_, start_at, end_at, event_id, max_alternatives,
+                                                          days_ahead, time_zone)
+        return report
+
+    def _find_alternatives(self, date_: date, start_at: time, end_at: time, event_id: str | None,
+                           max_alternatives: int, days_ahead: int, time_zone: str) -> list[tuple[date, time, time]]:
+        # The nearest windows on the same day, keeping the last place for the nearest window on a following day.
+        # Same-day windows fill every place when no following day within days_ahead has room
+        same_day = scan_occupancy(date_, occupancy(self.days, date_, time_zone), start_at, end_at,
+                                  event_id).alternatives
+        taken = min(len(same_day), max(max_alternatives - 1, 0))
+        alternatives = same_day[:taken]
+        next_date = date_
+        while len(alternatives) < max_alternatives and next_date < date_ + timedelta(days=days_ahead):
+            next_date += timedelta(days=1)
+            alternatives.extend(scan_occupancy(next_date, occupancy(self.days, next_date, time_zone), start_at,
+                                               end_at, event_id).alternatives[:1])
+        if len(alternatives) == taken:
+            alternatives = same_day[:max_alternatives]
+        return alternatives
+
+    @instrumented("calendar.update_event")
+    def update_event(self, event_id: str, title: str, description: str, date_: date, start_at: time, end_at: time,
+                     time_zone: str | None = None):
+        event = self.events.get(event_id)
+        if not event:
+            event_not_found_error()
 
+        time_zone = time_zone or self.time_zone
+        start, end = self._utc_range(date_, start_at, end_at, time_zone)
+        if self._find_conflicts(utc_segments(start, end), event_id):
+            slot_not_available_error(self.check_conflicts(date_, start_at, end_at, event_id, time_zone=time_zone))
+
+        self._prepare_write()
+        self._unbook(event)
+        event = self._writable_event(event_id)
+        event.title = title
+        event.description = description
+        event.date_ = start.date()
+        event.start_at = start.time()
+        event.end_at = end.time()
+        event.end_date = end.date()
+        event.time_zone = time_zone
+        self._book(event)
+        self.changes.publish(Change.UPDATE_EVENT, event_id, event.date_)
+
+    @instrumented("calendar.delete_event")
     def delete_event(self, event_id: str):
         if event_id not in self.events:
             event_not_found_error()
 
-        self.events.pop(event_id)
-
-        for day in self.days.values():
-            if event_id in day.slots.values():
-                day.delete_event(event_id)
-                break
-
-    def find_events(self, start_at: date, end_at: date) -> dict[date, list[Event]]:
-        events: dict[date, list[Event]] = {}
-        for event in self.events.values():
-            if start_at <= event.date_ <= end_at:
-                if event.date_ not in events:
-                    events[event.date_] = []
-                events[event.date_].append(event)
-        return events
+        self._prepare_write()
+        event = self.events.pop(event_id)
+        self._owned_events.discard(event_id)
+        self._unbook(event)
+        self.changes.publish(Change.DELETE_EVENT, event_id, event.date_)
+
+    @instrumented("calendar.find_events")
+    def find_events(self, start_at: date, end_at: date, time_zone: str | None = None) -> dict[date, list[Event]]:
+        _, events = with_archive(self.days, self.events, self.archive, self.archived_before, start_at, end_at)
+        return find_events_in_time_zone(events, start_at, end_at, time_zone or self.time_zone)
+
+    @instrumented("calendar.archive_before")
+    def archive_before(self, cutoff: date, archive: ArchiveService | None = None) -> tuple[int, int]:
+        # Moves the events that end before the cutoff, and the days that only hold such events, into per-year
+        # archive segments. They stay visible to find_events and find_available_slots but can no longer change
+        archive = archive or self.archive
+        if archive is None:
+            archive_not_configured_error()
+        if cutoff > current_date():
+            archive_cutoff_error()
+
+        events = {event_id: event for event_id, event in self.events.items() if event.end_date < cutoff}
+        # Slots can also hold events archived by an earlier call, which are no longer hot
+        days = {date_: day for date_, day in self.days.items()
+                if date_ < cutoff and all(event_id is None or event_id in events or event_id not in self.events
+                                          for event_id in day.slots.values())}
+        for year in sorted({date_.year for date_ in days} | {event.date_.year for event in events.values()}):
+            archive.save(year,
+                         {date_: day for date_, day in days.items() if date_.year == year},
+                         {event_id: event for event_id, event in events.items() if event.date_.year == year})
+
+        self._prepare_write()
+        for date_ in days:
+            del self.days[date_]
+            self._owned_days.discard(date_)
+        for event_id in events:
+            del self.events[event_id]
+            self._owned_events.discard(event_id)
+        self.archive = archive
+        self.archived_before = max(cutoff, self.archived_before or cutoff)
+        return len(days), len(events)
 
     def delete_reminder(self, event_id: str, reminder_index: int):
         event = self.events.get(event_id)
         if not event:
             event_not_found_error()
 
+        self._prepare_write()
+        event = self._writable_event(event_id)
         event.delete_reminder(reminder_index)
+        self.changes.publish(Change.DELETE_REMINDER, event_id, event.date_, reminder_index)
 
-    def list_reminders(self, event_id: str) -> list[Reminder]:
+    def list_reminders(self, event_id: str, time_zone: str | None = None) -> list[Reminder]:
         event = self.events.get(event_id)
         if not event:
             event_not_found_error()
 
-        return event.reminders
+        return reminders_in_time_zone(event.reminders, time_zone or self.time_zone)
 
 
 # TODO: Implement Day class here
 
 
-# TODO: Implement Calendar class here
\ No newline at end of file
+# TODO: Implement Calendar class here
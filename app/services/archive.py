@@ -0,0 +1,68 @@
+import pickle
+from pathlib import Path
+
+from app.services.util import compression_not_supported_error
+
+# Codec module names and the file suffix of their segments
+COMPRESSIONS: dict[str, str] = {"lzma": ".xz", "zlib": ".zz"}
+
+
+class ArchiveService:
+    def __init__(self, directory: str, compression: str = "lzma", cache_size: int = 2):
+        if compression not in COMPRESSIONS:
+            compression_not_supported_error(compression)
+        self.directory: str = directory
+        self.compression: str = compression
+        self.cache_size: int = cache_size
+        # Recently loaded segments by year, most recent last
+        self._cache: dict[int, tuple[dict, dict]] = {}
+
+    def __getstate__(self) -> dict:
+        return {"directory": self.directory, "compression": self.compression, "cache_size": self.cache_size}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._cache = {}
+
+    def segment_path(self, year: int) -> Path:
+        return Path(self.directory) / f"calendar-{year}{COMPRESSIONS[self.compression]}"
+
+    def years(self) -> list[int]:
+        suffix = COMPRESSIONS[self.compression]
+        return sorted(int(path.name[len("calendar-"):-len(suffix)])
+                      for path in Path(self.directory).glob(f"calendar-*{suffix}"))
+
+    def load(self, year: int) -> tuple[dict, dict]:
+        # Days and events archived for a year, as dicts keyed like Calendar.days and Calendar.events
+        if year in self._cache:
+            self._cache[year] = self._cache.pop(year)
+            return self._cache[year]
+
+        path = self.segment_path(year)
+        if path.exists():
+            segment = pickle.loads(self._codec().decompress(path.read_bytes()))
+        else:
+            segment = ({}, {})
+        self._cache[year] = segment
+        while len(self._cache) > self.cache_size:
+            self._cache.pop(next(iter(self._cache)))
+        return segment
+
+    def save(self, year: int, days: dict, events: dict):
+        # Merges the given days and events into the segment of the year
+        archived_days, archived_events = self.load(year)
+        archived_days = {**archived_days, **days}
+        archived_events = {**archived_events, **events}
+        path = self.segment_path(year)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(path.name + ".tmp")
+        temporary_path.write_bytes(self._codec().compress(pickle.dumps((archived_days, archived_events))))
+        temporary_path.replace(path)
+        self._cache[year] = (archived_days, archived_events)
+
+    def _codec(self):
+        if self.compression == "zlib":
+            import zlib
+            return zlib
+        import lzma
+        return lzma
@@ -0,0 +1,112 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, ClassVar
+
+from app.services.util import changes_not_available_error
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    ADD_EVENT: ClassVar[str] = "add_event"
+    UPDATE_EVENT: ClassVar[str] = "update_event"
+    DELETE_EVENT: ClassVar[str] = "delete_event"
+    ADD_REMINDER: ClassVar[str] = "add_reminder"
+    DELETE_REMINDER: ClassVar[str] = "delete_reminder"
+
+    sequence: int
+    operation: str
+    event_id: str
+    # UTC date the event is booked on after the change (before it, for deletions)
+    date_: date | None = None
+    reminder_index: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class QueueOverflow:
+    # Last item of a bounded queue that filled up and was unsubscribed. The consumer resubscribes with
+    # from_sequence=sequence to receive the changes it missed
+    sequence: int
+
+
+class ChangeFeed:
+    def __init__(self, capacity: int = 10_000, last_sequence: int = 0):
+        self.capacity: int = capacity
+        self.last_sequence: int = last_sequence
+        self._buffer: deque[Change] = deque(maxlen=capacity)
+        self._callbacks: list[Callable[[Change], None]] = []
+        # Queues and their capacity for changes, 0 for unbounded
+        self._queues: dict = {}
+
+    @property
+    def first_sequence(self) -> int:
+        # Oldest sequence number still in the buffer
+        return self._buffer[0].sequence if self._buffer else self.last_sequence + 1
+
+    def publish(self, operation: str, event_id: str, date_: date | None = None,
+                reminder_index: int | None = None) -> Change:
+        self.last_sequence += 1
+        change = Change(self.last_sequence, operation, event_id, date_, reminder_index)
+        self._buffer.append(change)
+        for callback in list(self._callbacks):
+            try:
+                callback(change)
+            except Exception:
+                # The change is already applied, so a failing subscriber must not fail the write or starve the
+                # others. It is dropped and can resubscribe with from_sequence
+                logger.exception("Change feed subscriber %r failed on change %d and was unsubscribed",
+                                 callback, change.sequence)
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+        for queue, maxsize in list(self._queues.items()):
+            self._put(queue, maxsize, change)
+        return change
+
+    def changes_since(self, sequence: int = 0) -> list[Change]:
+        # Every change after the given sequence number, oldest first
+        if sequence < self.first_sequence - 1:
+            changes_not_available_error(sequence)
+        if sequence >= self.last_sequence:
+            return []
+        skip = sequence - self.first_sequence + 1
+        return list(self._buffer)[max(skip, 0):]
+
+    def subscribe(self, callback: Callable[[Change], None],
+                  from_sequence: int | None = None) -> Callable[[Change], None]:
+        # Replays the buffered changes after from_sequence, then delivers new changes as they are published
+        if from_sequence is not None:
+            for change in self.changes_since(from_sequence):
+                callback(change)
+        self._callbacks.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[Change], None]):
+        self._callbacks.remove(callback)
+
+    def subscribe_queue(self, from_sequence: int | None = None, maxsize: int = 0):
+        # asyncio.Queue fed with the changes. It must be used from the thread that writes to the calendar. A
+        # bounded queue that fills up receives a QueueOverflow instead of the next change and is unsubscribed
+        import asyncio
+
+        # One extra place is kept for the QueueOverflow marker
+        queue = asyncio.Queue(maxsize=maxsize + 1 if maxsize else 0)
+        self._queues[queue] = maxsize
+        if from_sequence is not None:
+            for change in self.changes_since(from_sequence):
+                if not self._put(queue, maxsize, change):
+                    break
+        return queue
+
+    def unsubscribe_queue(self, queue):
+        del self._queues[queue]
+
+    def _put(self, queue, maxsize: int, change: Change) -> bool:
+        if maxsize and queue.qsize() >= maxsize:
+            queue.put_nowait(QueueOverflow(change.sequence - 1))
+            del self._queues[queue]
+            return False
+        queue.put_nowait(change)
+        return True
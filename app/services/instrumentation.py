@@ -0,0 +1,113 @@
+import os
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter_ns
+
+# Upper bounds (in microseconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_US: tuple[int, ...] = (10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000)
+
+
+class OperationStats:
+    def __init__(self):
+        self.calls: int = 0
+        self.errors: int = 0
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+        self.histogram: list[int] = [0] * (len(LATENCY_BUCKETS_US) + 1)
+
+    def record(self, elapsed_ns: int, failed: bool):
+        self.calls += 1
+        if failed:
+            self.errors += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.histogram[bisect_left(LATENCY_BUCKETS_US, elapsed_ns / 1_000)] += 1
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound}us" for bound in LATENCY_BUCKETS_US] + [f">{LATENCY_BUCKETS_US[-1]}us"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": self.total_ns / 1_000_000,
+            "mean_us": self.total_ns / self.calls / 1_000 if self.calls else 0.0,
+            "max_us": self.max_ns / 1_000,
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+
+class Instrumentation:
+    def __init__(self, enabled: bool = False):
+        self.enabled: bool = enabled
+        self.operations: dict[str, OperationStats] = {}
+        self.objects: dict[str, int] = {}
+
+    def record(self, name: str, elapsed_ns: int, failed: bool = False):
+        operation = self.operations.get(name)
+        if operation is None:
+            operation = self.operations[name] = OperationStats()
+        operation.record(elapsed_ns, failed)
+
+    def count_objects(self, calendar):
+        self.objects = {
+            "days": len(calendar.days),
+            "events": len(calendar.events),
+            "reminders": sum(len(event.reminders) for event in calendar.events.values()),
+        }
+
+    def reset(self):
+        self.operations.clear()
+        self.objects.clear()
+
+    def to_dict(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "operations": {name: operation.to_dict() for name, operation in sorted(self.operations.items())},
+            "objects": dict(self.objects),
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        import json
+
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def dump(self, file_path: str):
+        with open(file_path, mode="w") as file:
+            file.write(self.to_json())
+
+
+stats = Instrumentation(enabled=os.environ.get("CALENDAR_STATS", "") not in ("", "0"))
+
+
+def instrumented(name: str):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Fast path: a single attribute lookup when instrumentation is off
+            if not stats.enabled:
+                return func(*args, **kwargs)
+            failed = True
+            start = perf_counter_ns()
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                stats.record(name, perf_counter_ns() - start, failed)
+        return wrapper
+    return decorator
+
+
+def profile_call(func, *args, sort_by: str = "cumulative", limit: int = 20, **kwargs):
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(func, *args, **kwargs)
+    finally:
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats(sort_by).print_stats(limit)
+        print(output.getvalue())
+    return result
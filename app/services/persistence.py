@@ -1,16 +1,19 @@
 import pickle
 
 from app.model.calendar import Calendar
+from app.services.instrumentation import instrumented
 
 
 class PersistenceService:
     def __init__(self, file_path: str):
         self.file_path: str = file_path
 
+    @instrumented("persistence.save")
     def save(self, calendar: Calendar):
         with open(self.file_path, mode="wb") as file:
             pickle.dump(calendar, file)
 
+    @instrumented("persistence.load")
     def load(self) -> Calendar:
         with (open(self.file_path, mode="rb") as file):
             try:
@@ -0,0 +1,79 @@
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.services.util import time_zone_not_found_error
+
+UTC_ZONE = "UTC"
+SLOT = timedelta(minutes=15)
+
+
+@lru_cache(maxsize=None)
+def get_zone(zone_name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(zone_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        time_zone_not_found_error()
+
+
+def to_utc(zone_name: str, date_: date, time_: time) -> datetime:
+    # Naive UTC datetime for a wall-clock date and time in the given zone
+    if zone_name == UTC_ZONE:
+        return datetime.combine(date_, time_)
+    local = datetime.combine(date_, time_, tzinfo=get_zone(zone_name))
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_local(zone_name: str, utc_date: date, utc_time: time) -> datetime:
+    # Naive wall-clock datetime in the given zone for a UTC date and time
+    if zone_name == UTC_ZONE:
+        return datetime.combine(utc_date, utc_time)
+    offsets = utc_offsets(zone_name, utc_date)
+    if len(offsets) == 1:
+        return datetime.combine(utc_date, utc_time) + offsets[0][1]
+    index = bisect_right(offsets, utc_time, key=lambda entry: entry[0]) - 1
+    return datetime.combine(utc_date, utc_time) + offsets[index][1]
+
+
+@lru_cache(maxsize=4096)
+def utc_offsets(zone_name: str, utc_date: date) -> tuple[tuple[time, timedelta], ...]:
+    # UTC offsets in effect during a UTC day, as (UTC time the offset starts, offset) pairs. DST transitions
+    # are located once per zone-day so bulk conversions are a bisect instead of a tz database lookup
+    zone = get_zone(zone_name)
+    start = datetime.combine(utc_date, time(0), tzinfo=timezone.utc)
+    offsets = [(time(0), start.astimezone(zone).utcoffset())]
+    for step in range(1, 24 * 60 // 15):
+        probe = start + step * SLOT
+        offset = probe.astimezone(zone).utcoffset()
+        if offset == offsets[-1][1]:
+            continue
+        # Transitions happen on whole minutes; narrow it down within the previous slot
+        low, high = 0, 15
+        while high - low > 1:
+            middle = (low + high) // 2
+            if (probe - timedelta(minutes=15 - middle)).astimezone(zone).utcoffset() == offset:
+                high = middle
+            else:
+                low = middle
+        offsets.append(((probe - timedelta(minutes=15 - high)).time(), offset))
+    return tuple(offsets)
+
+
+@lru_cache(maxsize=4096)
+def local_day_slots(zone_name: str, local_date: date) -> tuple[tuple[time, date, time], ...]:
+    # Every slot of a wall-clock day in the given zone as (local time, UTC date, UTC time). Times skipped by a
+    # DST transition are missing and repeated times appear twice
+    zone = get_zone(zone_name)
+    start = datetime.combine(local_date, time(0), tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+    end = datetime.combine(local_date + timedelta(days=1), time(0), tzinfo=zone).astimezone(timezone.utc)
+    end = end.replace(tzinfo=None)
+    # Align to the UTC slot grid in case the zone offset is not a multiple of the slot length
+    current = start - timedelta(minutes=start.minute % 15, seconds=start.second, microseconds=start.microsecond)
+    slots = []
+    while current < end:
+        local = to_local(zone_name, current.date(), current.time())
+        if local.date() == local_date:
+            slots.append((local.time(), current.date(), current.time()))
+        current += SLOT
+    return tuple(slots)
@@ -1,7 +1,13 @@
-import uuid
+from datetime import date, datetime
+
+
+def current_date() -> date:
+    return datetime.now().date()
 
 
 def generate_unique_id():
+    import uuid
+
     # Generate a 5-character unique id
     return str(uuid.uuid4())[:5]
 
@@ -10,8 +16,15 @@ def event_not_found_error():
     raise ValueError('Event not found')
 
 
-def slot_not_available_error():
-    raise ValueError('There is already an event in this slot')
+class SlotNotAvailableError(ValueError):
+    def __init__(self, report=None):
+        super().__init__('There is already an event in this slot')
+        # ConflictReport with the conflicting event ids and free alternatives, when available
+        self.report = report
+
+
+def slot_not_available_error(report=None):
+    raise SlotNotAvailableError(report)
 
 
 def date_lower_than_today_error():
@@ -19,4 +32,32 @@ def date_lower_than_today_error():
 
 
 def reminder_not_found_error():
-    raise ValueError('Reminder not found')
\ No newline at end of file
+    raise ValueError('Reminder not found')
+
+
+def time_zone_not_found_error():
+    raise ValueError('Time zone not found')
+
+
+def invalid_time_range_error():
+    raise ValueError('End time must be later than start time')
+
+
+def changes_not_available_error(sequence: int):
+    raise ValueError(f'Changes after sequence {sequence} are no longer available')
+
+
+def compression_not_supported_error(compression: str):
+    raise ValueError(f'Compression {compression} not supported')
+
+
+def archive_not_configured_error():
+    raise ValueError('No archive configured for this calendar')
+
+
+def archive_cutoff_error():
+    raise ValueError('Archive cutoff cannot be later than today')
+
+
+def archived_date_error():
+    raise ValueError('Cannot book events on archived dates')
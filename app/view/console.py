@@ -1,21 +1,47 @@
-import argparse
-import shlex
-from datetime import date, time, datetime
-from importlib.resources import files
-from pathlib import Path
+from datetime import date, time, datetime, timedelta
 
-from app.model.calendar import Calendar
-from app.services.persistence import PersistenceService
+from app.services.instrumentation import stats, profile_call
+from app.services.util import SlotNotAvailableError, current_date
+
+# The model, persistence and parsing modules (and typing) are imported on first use to keep startup cheap
+
+# Commands that modify the calendar and require saving it in one-shot mode
+MUTATING_COMMANDS: frozenset[str] = frozenset({"add_event", "update_event", "delete_event",
+                                               "add_reminder", "delete_reminder", "time_zone", "archive"})
 
 
 class ConsoleView:
-    def __init__(self, calendar: Calendar = None):
-        file_path = str(files("app").joinpath(Path("data/calendar.data")))
-        self.persistence_service: PersistenceService = PersistenceService(file_path)
-        if not calendar:
-            self.calendar: Calendar = self.persistence_service.load()
-        else:
-            self.calendar: Calendar = calendar
+    def __init__(self, calendar: "Calendar" = None):
+        self._persistence_service: "PersistenceService | None" = None
+        self._calendar: "Calendar | None" = calendar or None
+        # Whether the last command reported an error, for the exit status of one-shot mode
+        self.command_failed: bool = False
+
+    @property
+    def persistence_service(self) -> "PersistenceService":
+        if self._persistence_service is None:
+            from importlib.resources import files
+            from pathlib import Path
+
+            from app.services.persistence import PersistenceService
+
+            file_path = str(files("app").joinpath(Path("data/calendar.data")))
+            self._persistence_service = PersistenceService(file_path)
+        return self._persistence_service
+
+    @property
+    def calendar(self) -> "Calendar":
+        if self._calendar is None:
+            self._calendar = self.persistence_service.load()
+        return self._calendar
+
+    @calendar.setter
+    def calendar(self, calendar: "Calendar"):
+        self._calendar = calendar
+
+    @property
+    def calendar_loaded(self) -> bool:
+        return self._calendar is not None
 
     @staticmethod
     def show_welcome_msg():
@@ -38,6 +64,10 @@ class ConsoleView:
             print("delete_reminder - delete a reminder from an event")
             print("list_reminders - list all reminders")
             print("available_slots - list all available slots in a specific date range")
+            print("time_zone - view or change the calendar time zone")
+            print("archive - move past events into compressed archive files")
+            print("stats - view or dump instrumentation statistics")
+            print("profile - run a single command under cProfile")
             print("exit - close the application")
         else:
             match command:
@@ -75,6 +105,24 @@ class ConsoleView:
                     print("List all available slots in a specific date")
                     print("Usage: available_slots <date>")
                     print("Example: available_slots 2021-10-15 2021-10-16")
+                case "time_zone":
+                    print("View or change the time zone used for dates and times. Most commands also accept "
+                          "--tz <zone> to use a different zone for a single command")
+                    print("Usage: time_zone [<zone>]")
+                    print("Example: time_zone America/Bogota")
+                case "archive":
+                    print("Move events that ended before a date, or more than a number of days ago, into "
+                          "compressed per-year archive files. Archived events still show up in find_events")
+                    print("Usage: archive [<date>] [--keep-days <days>]")
+                    print("Example: archive --keep-days 365")
+                case "stats":
+                    print("View, export, reset or toggle call counts, latency histograms and object counts")
+                    print("Usage: stats [show|json|reset|on|off] [--file <path>]")
+                    print("Example: stats json --file stats.json")
+                case "profile":
+                    print("Run a single command under cProfile and print the top functions by cumulative time")
+                    print("Usage: profile <command> [args...]")
+                    print("Example: profile find_events 2021-10-15 2021-10-16")
                 case _:
                     print(f">>> ERROR: command {command} not supported. Type 'help' to view the list of commands")
 
@@ -84,9 +132,12 @@ class ConsoleView:
                                                args.description,
                                                datetime.strptime(args.date, '%Y-%m-%d').date(),
                                                datetime.strptime(args.start_at, '%H:%M').time(),
-                                               datetime.strptime(args.end_at, '%H:%M').time())
+                                               datetime.strptime(args.end_at, '%H:%M').time(),
+                                               args.tz)
+        except SlotNotAvailableError as e:
+            self.show_conflicts(e)
         except ValueError as e:
-            print(f">>> ERROR: {e}")
+            self.show_error(e)
         else:
             print(f"Event added successfully with id {event_id}")
 
@@ -97,23 +148,41 @@ class ConsoleView:
                                        args.description,
                                        datetime.strptime(args.date, '%Y-%m-%d').date(),
                                        datetime.strptime(args.start_at, '%H:%M').time(),
-                                       datetime.strptime(args.end_at, '%H:%M').time())
+                                       datetime.strptime(args.end_at, '%H:%M').time(),
+                                       args.tz)
+        except SlotNotAvailableError as e:
+            self.show_conflicts(e)
         except ValueError as e:
-            print(f">>> ERROR: {e}")
+            self.show_error(e)
         else:
             print("Event updated successfully")
 
+    def show_error(self, error: Exception | str):
+        print(f">>> ERROR: {error}")
+        self.command_failed = True
+
+    def show_conflicts(self, error: SlotNotAvailableError):
+        self.show_error(error)
+        if error.report:
+            print(error.report)
+
     def delete_event(self, args):
         try:
             self.calendar.delete_event(args.event_id)
         except ValueError as e:
-            print(f">>> ERROR: {e}")
+            self.show_error(e)
         else:
             print("Event deleted successfully")
 
     def find_events(self, args):
-        events = self.calendar.find_events(datetime.strptime(args.start_at, '%Y-%m-%d').date(),
-                                           datetime.strptime(args.end_at, '%Y-%m-%d').date())
+        try:
+            events = self.calendar.find_events(datetime.strptime(args.start_at, '%Y-%m-%d').date(),
+                                               datetime.strptime(args.end_at, '%Y-%m-%d').date(),
+                                               args.tz)
+        except ValueError as e:
+            self.show_error(e)
+            return
+
         if events:
             for date_, events_ in events.items():
                 print(f"Events on {date_}:")
@@ -128,9 +197,10 @@ class ConsoleView:
         try:
             self.calendar.add_reminder(args.event_id,
                                        datetime.strptime(args.date_time, '%Y-%m-%d %H:%M'),
-                                       args.type)
+                                       args.type,
+                                       args.tz)
         except ValueError as e:
-            print(f">>> ERROR: {e}")
+            self.show_error(e)
         else:
             print("Reminder added successfully")
 
@@ -138,12 +208,17 @@ class ConsoleView:
         try:
             self.calendar.delete_reminder(args.event_id, args.reminder_index - 1)
         except ValueError as e:
-            print(f">>> ERROR: {e}")
+            self.show_error(e)
         else:
             print("Reminder deleted successfully")
 
     def list_reminders(self, args):
-        reminders = self.calendar.list_reminders(args.event_id)
+        try:
+            reminders = self.calendar.list_reminders(args.event_id, args.tz)
+        except ValueError as e:
+            self.show_error(e)
+            return
+
         if reminders:
             for i, reminder in enumerate(reminders, start=1):
                 print(f"{i}. {reminder}")
@@ -151,8 +226,13 @@ class ConsoleView:
             print("No reminders found")
 
     def find_available_slots(self, args):
-        available_slots = self.calendar.find_available_slots(
-                                            datetime.strptime(args.date, '%Y-%m-%d').date())
+        try:
+            available_slots = self.calendar.find_available_slots(
+                                                datetime.strptime(args.date, '%Y-%m-%d').date(),
+                                                args.tz)
+        except ValueError as e:
+            self.show_error(e)
+            return
 
         if available_slots:
             print(f"Available slots on {args.date}:")
@@ -161,10 +241,83 @@ class ConsoleView:
         else:
             print("No available slots found")
 
+    def time_zone(self, args):
+        if args.time_zone:
+            try:
+                self.calendar.set_time_zone(args.time_zone)
+            except ValueError as e:
+                self.show_error(e)
+                return
+        print(f"Calendar time zone: {self.calendar.time_zone}")
+
+    def archive_events(self, args):
+        from pathlib import Path
+
+        from app.services.archive import ArchiveService
+
+        archive = self.calendar.archive
+        if archive is None:
+            archive = ArchiveService(str(Path(self.persistence_service.file_path).parent / "archive"))
+        try:
+            if args.cutoff:
+                cutoff = datetime.strptime(args.cutoff, '%Y-%m-%d').date()
+            else:
+                cutoff = current_date() - timedelta(days=args.keep_days)
+            days, events = self.calendar.archive_before(cutoff, archive)
+        except ValueError as e:
+            self.show_error(e)
+        else:
+            print(f"Archived {events} events and {days} days before {cutoff}")
+
+    def show_stats(self, args):
+        match args.action:
+            case "on":
+                stats.enabled = True
+                print("Instrumentation enabled")
+                return
+            case "off":
+                stats.enabled = False
+                print("Instrumentation disabled")
+                return
+            case "reset":
+                stats.reset()
+                print("Instrumentation statistics reset")
+                return
+
+        stats.count_objects(self.calendar)
+        if args.file:
+            stats.dump(args.file)
+            print(f"Statistics written to {args.file}")
+        elif args.action == "json":
+            print(stats.to_json())
+        else:
+            print(f"Instrumentation: {'enabled' if stats.enabled else 'disabled'}")
+            print("Objects: " + ", ".join(f"{name}={count}" for name, count in stats.objects.items()))
+            if not stats.operations:
+                print("No operations recorded")
+            for name, operation in sorted(stats.operations.items()):
+                summary = operation.to_dict()
+                print(f"- {name}: {summary['calls']} calls, {summary['errors']} errors, "
+                      f"mean {summary['mean_us']:.1f}us, max {summary['max_us']:.1f}us")
+
+    def profile_command(self, params: list[str]) -> bool:
+        if not params:
+            self.show_error("profile requires a command. Type 'help profile' to view the usage")
+            return False
+        import shlex
+
+        return profile_call(self.process_user_command, shlex.join(params))
+
     def save_calendar(self):
-        self.persistence_service.save(self.calendar)
+        # A calendar that was never loaded cannot have changed
+        if self.calendar_loaded:
+            self.persistence_service.save(self.calendar)
 
     def process_user_command(self, user_input: str) -> bool:
+        import argparse
+        import shlex
+
+        self.command_failed = False
         line = shlex.split(user_input)
         command = line[0]
         params = line[1:]
@@ -183,6 +336,7 @@ class ConsoleView:
                 parser.add_argument("date", type=str, help="Event date")
                 parser.add_argument("start_at", type=str, help="Event start time")
                 parser.add_argument("end_at", type=str, help="Event end time")
+                parser.add_argument("--tz", type=str, help="Time zone of the dates and times, e.g. Europe/Madrid")
                 args = parser.parse_args(params)
                 self.add_event(args)
             case "update_event":
@@ -192,6 +346,7 @@ class ConsoleView:
                 parser.add_argument("date", type=str, help="Event date")
                 parser.add_argument("start_at", type=str, help="Event start time")
                 parser.add_argument("end_at", type=str, help="Event end time")
+                parser.add_argument("--tz", type=str, help="Time zone of the dates and times, e.g. Europe/Madrid")
                 args = parser.parse_args(params)
                 self.update_event(args)
             case "delete_event":
@@ -201,12 +356,14 @@ class ConsoleView:
             case "find_events":
                 parser.add_argument("start_at", type=str, help="Start date")
                 parser.add_argument("end_at", type=str, help="End date")
+                parser.add_argument("--tz", type=str, help="Time zone of the dates and times, e.g. Europe/Madrid")
                 args = parser.parse_args(params)
                 self.find_events(args)
             case "add_reminder":
                 parser.add_argument("event_id", type=str, help="Event id")
                 parser.add_argument("date_time", type=str, help="Reminder date and time")
                 parser.add_argument("type", type=str, help="Reminder type: email or system")
+                parser.add_argument("--tz", type=str, help="Time zone of the dates and times, e.g. Europe/Madrid")
                 args = parser.parse_args(params)
                 self.add_reminder(args)
             case "delete_reminder":
@@ -216,17 +373,60 @@ class ConsoleView:
                 self.delete_reminder(args)
             case "list_reminders":
                 parser.add_argument("event_id", type=str, help="Event id")
+                parser.add_argument("--tz", type=str, help="Time zone of the dates and times, e.g. Europe/Madrid")
                 args = parser.parse_args(params)
                 self.list_reminders(args)
             case "available_slots":
                 parser.add_argument("date", type=str, help="Date to check")
+                parser.add_argument("--tz", type=str, help="Time zone of the dates and times, e.g. Europe/Madrid")
                 args = parser.parse_args(params)
                 self.find_available_slots(args)
+            case "time_zone":
+                parser.add_argument("time_zone", type=str, nargs="?", help="New calendar time zone")
+                args = parser.parse_args(params)
+                self.time_zone(args)
+            case "archive":
+                parser.add_argument("cutoff", type=str, nargs="?", help="Archive events that ended before this date")
+                parser.add_argument("--keep-days", type=int, default=365,
+                                    help="Without a date, archive events that ended more than this many days ago")
+                args = parser.parse_args(params)
+                self.archive_events(args)
+            case "stats":
+                parser.add_argument("action", type=str, nargs="?", default="show",
+                                    choices=["show", "json", "reset", "on", "off"], help="Stats action")
+                parser.add_argument("--file", type=str, help="Write the statistics as JSON to this file")
+                args = parser.parse_args(params)
+                self.show_stats(args)
+            case "profile":
+                return self.profile_command(params)
             case "exit":
                 self.save_calendar()
                 return True
             case _:
-                print(">>> ERROR: Invalid command. Type 'help' to view the list of commands")
+                self.show_error("Invalid command. Type 'help' to view the list of commands")
+
+    def run_once(self, argv: list[str]) -> int:
+        # Runs a single command and returns the process exit status. Failed commands leave nothing to save
+        import shlex
+
+        self.process_user_command(shlex.join(argv))
+        if self.command_failed:
+            return 1
+        if self.is_mutating(argv):
+            self.save_calendar()
+        return 0
+
+    @staticmethod
+    def is_mutating(argv: list[str]) -> bool:
+        # profile runs the command that follows it, and time_zone without a zone only shows the current one
+        match argv:
+            case ["profile", *command]:
+                return bool(command) and ConsoleView.is_mutating(command)
+            case ["time_zone"]:
+                return False
+            case [command, *_]:
+                return command in MUTATING_COMMANDS
+        return False
 
     def app_loop(self):
         ConsoleView.show_welcome_msg()
@@ -0,0 +1,83 @@
+import argparse
+import pickle
+import sys
+import tempfile
+import time
+from datetime import date, time as time_, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app.model.calendar  # noqa: E402
+from app.model.calendar import Calendar  # noqa: E402
+from app.services.archive import ArchiveService  # noqa: E402
+
+TODAY = date.today()
+
+
+def build(years: int, events_per_day: int) -> Calendar:
+    # add_event rejects past dates, so history is written as if today were its first day. It ends a month
+    # from today
+    start = TODAY - timedelta(days=365 * years)
+    current_date = app.model.calendar.current_date
+    app.model.calendar.current_date = lambda: start
+    try:
+        calendar = Calendar()
+        for offset in range(365 * years + 30):
+            for hour in range(events_per_day):
+                calendar.add_event(f"Event {offset}-{hour}", "Synthetic history", start + timedelta(days=offset),
+                                   time_(hour * 2, 0), time_(hour * 2, 45))
+    finally:
+        app.model.calendar.current_date = current_date
+    return calendar
+
+
+def measure(label: str, calendar: Calendar):
+    size = len(pickle.dumps(calendar))
+    start = time.perf_counter()
+    calendar.find_events(TODAY, TODAY + timedelta(days=30))
+    find_ms = (time.perf_counter() - start) * 1_000
+    start = time.perf_counter()
+    pickle.loads(pickle.dumps(calendar))
+    round_trip_ms = (time.perf_counter() - start) * 1_000
+    print(f"{label:>16}: {len(calendar.days):,} days, {len(calendar.events):,} events, pickle {size / 1_000_000:.1f}MB, "
+          f"save+load {round_trip_ms:.0f}ms, find_events (next 30 days) {find_ms:.2f}ms")
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Working-set reduction from archiving a multi-year calendar")
+    parser.add_argument("--years", type=int, default=5, help="Years of synthetic history")
+    parser.add_argument("--events-per-day", type=int, default=6, help="Events per day")
+    parser.add_argument("--keep-days", type=int, default=365, help="Active window kept in memory")
+    parser.add_argument("--compression", choices=["lzma", "zlib"], default="lzma", help="Segment compression")
+    args = parser.parse_args()
+
+    calendar = build(args.years, args.events_per_day)
+    before = measure("before archive", calendar)
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive = ArchiveService(directory, args.compression)
+        start = time.perf_counter()
+        calendar.archive_before(TODAY - timedelta(days=args.keep_days), archive)
+        archive_s = time.perf_counter() - start
+        after = measure("after archive", calendar)
+        on_disk = sum(path.stat().st_size for path in Path(directory).iterdir())
+        print(f"archived in {archive_s:.1f}s into {len(archive.years())} segments, {on_disk / 1_000:.0f}kB "
+              f"on disk ({args.compression})")
+        print(f"working set reduced by {100 * (1 - after / before):.0f}% ({before / 1_000_000:.1f}MB -> "
+              f"{after / 1_000_000:.1f}MB pickled)")
+
+        # A fresh service has no decoded segments cached
+        calendar.archive = ArchiveService(directory, args.compression)
+        old = TODAY - timedelta(days=365 * args.years - 30)
+        for label in ("cold", "warm"):
+            start = time.perf_counter()
+            found = calendar.find_events(old, old + timedelta(days=30))
+            elapsed_ms = (time.perf_counter() - start) * 1_000
+            print(f"find_events on archived range ({label}): {sum(map(len, found.values()))} events, "
+                  f"{elapsed_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
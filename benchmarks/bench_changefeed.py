@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date, time as time_, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.model.calendar import Calendar  # noqa: E402
+from app.services.changefeed import ChangeFeed  # noqa: E402
+
+START_DATE = date.today() + timedelta(days=1)
+
+
+def bulk_write(calendar: Calendar, writes: int):
+    # Alternating add/delete traffic spread over a year of days
+    for index in range(writes // 2):
+        date_ = START_DATE + timedelta(days=index % 365)
+        hour = index % 24
+        event_id = calendar.add_event("Write", "Bulk write", date_, time_(hour, 0), time_(hour, 15))
+        calendar.delete_event(event_id)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Change feed throughput against bulk write rates")
+    parser.add_argument("--writes", type=int, default=50_000, help="Number of write operations")
+    args = parser.parse_args()
+
+    baseline = Calendar()
+    write_time = timed(lambda: bulk_write(baseline, args.writes))
+    print(f"bulk writes, no subscribers: {args.writes / write_time:,.0f} writes/s")
+
+    calendar = Calendar()
+    # Large enough to replay the whole run
+    calendar.changes = ChangeFeed(capacity=args.writes)
+    received = []
+    calendar.changes.subscribe(received.append)
+    write_time = timed(lambda: bulk_write(calendar, args.writes))
+    print(f"bulk writes, sync subscriber: {args.writes / write_time:,.0f} writes/s, "
+          f"received {len(received)}/{calendar.changes.last_sequence}")
+
+    replayed = []
+    replay_time = timed(lambda: replayed.extend(calendar.changes.changes_since(0)))
+    print(f"replay from sequence 0: {len(replayed) / replay_time:,.0f} changes/s")
+
+    async def consume_async() -> tuple[int, float]:
+        queue = calendar.changes.subscribe_queue(from_sequence=0)
+        start = time.perf_counter()
+        consumed = 0
+        while not queue.empty():
+            await queue.get()
+            consumed += 1
+        return consumed, time.perf_counter() - start
+
+    consumed, consume_time = asyncio.run(consume_async())
+    print(f"asyncio queue replay: {consumed / consume_time:,.0f} changes/s ({consumed} changes)")
+
+    if len(received) != calendar.changes.last_sequence or consumed != calendar.changes.last_sequence:
+        print("consumers fell behind")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
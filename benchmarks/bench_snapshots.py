@@ -0,0 +1,84 @@
+import argparse
+import copy
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, time as time_, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.model.calendar import Calendar  # noqa: E402
+
+START_DATE = date.today() + timedelta(days=1)
+
+
+def populate(calendar: Calendar, days: int, events_per_day: int):
+    for offset in range(days):
+        for hour in range(events_per_day):
+            calendar.add_event(f"Event {offset}-{hour}", "Seed event", START_DATE + timedelta(days=offset),
+                               time_(hour, 0), time_(hour, 30))
+
+
+def write(calendar: Calendar, rng: random.Random, days: int):
+    date_ = START_DATE + timedelta(days=rng.randrange(days))
+    hour = rng.randrange(12, 24)
+    try:
+        event_id = calendar.add_event("Write", "Write traffic", date_, time_(hour, 0), time_(hour, 15))
+    except ValueError:
+        return
+    if rng.random() < 0.5:
+        calendar.delete_event(event_id)
+
+
+def run(snapshot_fn, writes: int, every: int, days: int, events_per_day: int, seed: int) -> dict:
+    calendar = Calendar()
+    populate(calendar, days, events_per_day)
+    rng = random.Random(seed)
+    snapshots = []
+    snapshot_ns = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for index in range(writes):
+        if index % every == 0:
+            taken = time.perf_counter_ns()
+            snapshots.append(snapshot_fn(calendar))
+            snapshot_ns.append(time.perf_counter_ns() - taken)
+        write(calendar, rng, days)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "snapshots": len(snapshots),
+        "snapshot_median_us": statistics.median(snapshot_ns) / 1_000,
+        "writes_per_s": writes / elapsed,
+        "retained_mb": current / 1_000_000,
+        "peak_mb": peak / 1_000_000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot latency and memory under heavy write traffic")
+    parser.add_argument("--writes", type=int, default=20_000, help="Number of write operations")
+    parser.add_argument("--every", type=int, default=100, help="Take a snapshot every N writes")
+    parser.add_argument("--days", type=int, default=365, help="Number of days in the seed calendar")
+    parser.add_argument("--events-per-day", type=int, default=8, help="Seed events per day")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    strategies = {
+        "no snapshots": lambda calendar: None,
+        "copy-on-write snapshot": Calendar.snapshot,
+        "deepcopy": copy.deepcopy,
+    }
+    for name, snapshot_fn in strategies.items():
+        result = run(snapshot_fn, args.writes, args.every, args.days, args.events_per_day, args.seed)
+        print(f"{name:>24}: {result['snapshots']} snapshots, median {result['snapshot_median_us']:.1f}us each, "
+              f"{result['writes_per_s']:,.0f} writes/s, retained {result['retained_mb']:.1f}MB, "
+              f"peak {result['peak_mb']:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
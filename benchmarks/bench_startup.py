@@ -0,0 +1,70 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time budgets in microseconds, as reported by python -X importtime
+IMPORT_BUDGETS_US: dict[str, int] = {
+    "app.main": 5_000,
+    "app.view.console": 20_000,
+}
+
+# Modules that must not be imported before the first command runs
+DEFERRED_MODULES: tuple[str, ...] = ("argparse", "shlex", "typing", "importlib.resources", "app.model.calendar",
+                                     "app.services.persistence", "dataclasses", "uuid", "json")
+
+
+def import_times(statement: str) -> dict[str, int]:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        cumulative = cumulative.strip()
+        if cumulative.isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def wall_time(argv: list[str], runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "app.main", *argv], cwd=ROOT, capture_output=True, check=True)
+        samples.append((time.perf_counter() - start) * 1_000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CalendarApp startup cost against a budget")
+    parser.add_argument("--runs", type=int, default=10, help="Number of one-shot invocations to time")
+    args = parser.parse_args()
+
+    over_budget = False
+    times = import_times("from app.view.console import ConsoleView; ConsoleView()")
+    for module, budget in IMPORT_BUDGETS_US.items():
+        # Take the best of a few runs, import time is noisy on a cold cache
+        best = min(import_times(f"import {module}").get(module, 0) for _ in range(3))
+        status = "ok" if best <= budget else "OVER BUDGET"
+        over_budget |= best > budget
+        print(f"import {module}: {best}us (budget {budget}us) {status}")
+
+    leaked = [module for module in DEFERRED_MODULES if module in times]
+    over_budget |= bool(leaked)
+    print(f"deferred modules imported at construction: {', '.join(leaked) if leaked else 'none'}")
+
+    samples = wall_time(["help"], args.runs)
+    print(f"one-shot 'help': median {statistics.median(samples):.1f}ms, min {min(samples):.1f}ms "
+          f"over {args.runs} runs")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
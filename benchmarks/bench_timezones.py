@@ -0,0 +1,60 @@
+import argparse
+import sys
+import timeit
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.model.calendar import Calendar  # noqa: E402
+
+START_DATE = date.today() + timedelta(days=1)
+
+
+def build(days: int, events_per_day: int) -> Calendar:
+    calendar = Calendar("America/New_York")
+    for offset in range(days):
+        for hour in range(events_per_day):
+            calendar.add_event(f"Event {offset}-{hour}", "Seed event", START_DATE + timedelta(days=offset),
+                               time(hour * 2, 0), time(hour * 2, 45))
+    return calendar
+
+
+def stdlib_find_events(calendar: Calendar, start_at: date, end_at: date, zone_name: str) -> int:
+    # Reference: convert every event with zoneinfo directly
+    zone = ZoneInfo(zone_name)
+    found = 0
+    for event in calendar.events.values():
+        local = datetime.combine(event.date_, event.start_at, tzinfo=timezone.utc).astimezone(zone)
+        if start_at <= local.date() <= end_at:
+            datetime.combine(event.end_date, event.end_at, tzinfo=timezone.utc).astimezone(zone)
+            found += 1
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of time zone conversions in bulk range queries")
+    parser.add_argument("--days", type=int, default=365, help="Number of days in the calendar")
+    parser.add_argument("--events-per-day", type=int, default=8, help="Events per day")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args()
+
+    calendar = build(args.days, args.events_per_day)
+    end_date = START_DATE + timedelta(days=args.days)
+    cases = {
+        "find_events UTC": lambda: calendar.find_events(START_DATE, end_date, "UTC"),
+        "find_events America/New_York": lambda: calendar.find_events(START_DATE, end_date),
+        "find_events Asia/Kolkata": lambda: calendar.find_events(START_DATE, end_date, "Asia/Kolkata"),
+        "zoneinfo conversions only America/New_York": lambda: stdlib_find_events(calendar, START_DATE, end_date,
+                                                                          "America/New_York"),
+        "find_available_slots x30 America/New_York": lambda: [
+            calendar.find_available_slots(START_DATE + timedelta(days=offset)) for offset in range(30)],
+    }
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{name:>42}: {best * 1_000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
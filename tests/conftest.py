@@ -0,0 +1,14 @@
+from datetime import date
+
+import pytest
+
+import app.model.calendar
+
+# The fixtures in these tests were written against this date
+TODAY = date(2024, 5, 1)
+
+
+@pytest.fixture(autouse=True)
+def fixed_current_date(monkeypatch):
+    monkeypatch.setattr(app.model.calendar, "current_date", lambda: TODAY)
+    return TODAY
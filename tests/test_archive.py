@@ -0,0 +1,112 @@
+import pickle
+from datetime import date, time
+
+import pytest
+
+import app.model.calendar
+from app.model.calendar import Calendar
+from app.services.archive import ArchiveService
+
+
+@pytest.fixture()
+def archive(tmp_path):
+    return ArchiveService(str(tmp_path / "archive"))
+
+
+@pytest.fixture()
+def calendar_with_history(monkeypatch):
+    monkeypatch.setattr(app.model.calendar, "current_date", lambda: date(2022, 1, 1))
+    calendar = Calendar()
+    for date_ in (date(2022, 6, 1), date(2023, 6, 1), date(2024, 6, 1)):
+        calendar.add_event(f"Event {date_.year}", "Event description", date_, time(10, 0), time(11, 0))
+    monkeypatch.setattr(app.model.calendar, "current_date", lambda: date(2024, 5, 1))
+    return calendar
+
+
+class TestArchiveService:
+    @pytest.mark.parametrize("compression", ["lzma", "zlib"])
+    def test_save_and_load_segment(self, tmp_path, compression):
+        archive = ArchiveService(str(tmp_path), compression)
+        archive.save(2023, {date(2023, 1, 1): "day"}, {"event_id": "event"})
+        assert ArchiveService(str(tmp_path), compression).load(2023) == ({date(2023, 1, 1): "day"},
+                                                                         {"event_id": "event"})
+        assert archive.years() == [2023]
+
+    def test_save_merges_into_existing_segment(self, archive):
+        archive.save(2023, {}, {"event_1": "event"})
+        archive.save(2023, {}, {"event_2": "event"})
+        assert set(archive.load(2023)[1]) == {"event_1", "event_2"}
+
+    def test_load_missing_segment_is_empty(self, archive):
+        assert archive.load(2020) == ({}, {})
+
+    def test_unknown_compression_raises_value_error(self, tmp_path):
+        with pytest.raises(ValueError):
+            ArchiveService(str(tmp_path), "snappy")
+
+
+class TestCalendarArchive:
+    def test_archive_before_moves_old_days_and_events(self, calendar_with_history, archive):
+        assert calendar_with_history.archive_before(date(2024, 1, 1), archive) == (2, 2)
+        assert [event.title for event in calendar_with_history.events.values()] == ["Event 2024"]
+        assert list(calendar_with_history.days) == [date(2024, 6, 1)]
+        assert archive.years() == [2022, 2023]
+
+    def test_archived_events_stay_queryable(self, calendar_with_history, archive):
+        calendar_with_history.archive_before(date(2024, 1, 1), archive)
+        events = calendar_with_history.find_events(date(2022, 1, 1), date(2024, 12, 31))
+        assert sorted(events) == [date(2022, 6, 1), date(2023, 6, 1), date(2024, 6, 1)]
+        assert len(calendar_with_history.find_available_slots(date(2023, 6, 1))) == 92
+
+    def test_archived_events_cannot_be_deleted(self, calendar_with_history, archive):
+        calendar_with_history.archive_before(date(2024, 1, 1), archive)
+        event_id = calendar_with_history.find_events(date(2023, 6, 1), date(2023, 6, 1))[date(2023, 6, 1)][0].id
+        with pytest.raises(ValueError):
+            calendar_with_history.delete_event(event_id)
+
+    def test_events_cannot_move_onto_archived_dates(self, calendar_with_history, archive):
+        calendar_with_history.archive_before(date(2024, 1, 1), archive)
+        event_id = next(iter(calendar_with_history.events))
+        with pytest.raises(ValueError):
+            calendar_with_history.update_event(event_id, "Event", "Event description", date(2023, 6, 1),
+                                               time(10, 0), time(11, 0))
+        assert calendar_with_history.events[event_id].date_ == date(2024, 6, 1)
+        assert date(2023, 6, 1) not in calendar_with_history.days
+        assert len(calendar_with_history.find_events(date(2023, 6, 1), date(2023, 6, 1))[date(2023, 6, 1)]) == 1
+        assert len(calendar_with_history.find_available_slots(date(2023, 6, 1))) == 92
+
+    def test_events_cannot_start_on_archived_utc_date(self, calendar_with_history, archive):
+        calendar_with_history.archive_before(date(2024, 5, 1), archive)
+        # Early on the first hot local date in Tokyo is still the previous, archived, UTC date
+        with pytest.raises(ValueError):
+            calendar_with_history.add_event("Event", "Event description", date(2024, 5, 1), time(8, 0), time(9, 0),
+                                            "Asia/Tokyo")
+        calendar_with_history.add_event("Event", "Event description", date(2024, 5, 1), time(10, 0), time(11, 0),
+                                        "Asia/Tokyo")
+
+    def test_archive_before_requires_archive(self, calendar_with_history):
+        with pytest.raises(ValueError):
+            calendar_with_history.archive_before(date(2024, 1, 1))
+
+    def test_archive_cutoff_cannot_be_in_the_future(self, calendar_with_history, archive):
+        with pytest.raises(ValueError):
+            calendar_with_history.archive_before(date(2025, 1, 1), archive)
+
+    def test_day_shared_with_earlier_archived_events_is_archived_later(self, archive, monkeypatch):
+        calendar = Calendar()
+        calendar.add_event("Event 1", "Event description", date(2024, 5, 2), time(9, 0), time(10, 0))
+        # Runs past UTC midnight, so it ends after the first cutoff
+        calendar.add_event("Event 2", "Event description", date(2024, 5, 2), time(18, 0), time(21, 0),
+                           "America/New_York")
+        monkeypatch.setattr(app.model.calendar, "current_date", lambda: date(2024, 5, 10))
+        assert calendar.archive_before(date(2024, 5, 3), archive) == (0, 1)
+        assert calendar.archive_before(date(2024, 5, 10), archive) == (2, 1)
+        assert calendar.days == {} and calendar.events == {}
+        assert len(calendar.find_events(date(2024, 5, 2), date(2024, 5, 2), "UTC")[date(2024, 5, 2)]) == 2
+        assert len(calendar.find_available_slots(date(2024, 5, 2), "UTC")) == 84
+
+    def test_archive_survives_pickling(self, calendar_with_history, archive):
+        calendar_with_history.archive_before(date(2024, 1, 1), archive)
+        calendar = pickle.loads(pickle.dumps(calendar_with_history))
+        assert calendar.archived_before == date(2024, 1, 1)
+        assert date(2022, 6, 1) in calendar.find_events(date(2022, 1, 1), date(2022, 12, 31))
@@ -0,0 +1,149 @@
+import asyncio
+import pickle
+from datetime import date, datetime, time
+
+import pytest
+
+from app.model.calendar import Calendar, Reminder
+from app.services.changefeed import Change, ChangeFeed, QueueOverflow
+
+
+@pytest.fixture()
+def calendar():
+    return Calendar()
+
+
+def add_event(calendar, hour=10):
+    return calendar.add_event("Event", "Event description", date(2024, 5, 1), time(hour, 0), time(hour, 30))
+
+
+class TestChangeFeed:
+    def test_publish_assigns_increasing_sequence_numbers(self):
+        feed = ChangeFeed()
+        first = feed.publish(Change.ADD_EVENT, "event_1")
+        second = feed.publish(Change.DELETE_EVENT, "event_1")
+        assert (first.sequence, second.sequence) == (1, 2)
+        assert feed.last_sequence == 2
+
+    def test_buffer_is_bounded(self):
+        feed = ChangeFeed(capacity=3)
+        for index in range(5):
+            feed.publish(Change.ADD_EVENT, f"event_{index}")
+        assert [change.sequence for change in feed.changes_since(2)] == [3, 4, 5]
+        with pytest.raises(ValueError):
+            feed.changes_since(1)
+
+    def test_changes_since_last_sequence_is_empty(self):
+        feed = ChangeFeed()
+        feed.publish(Change.ADD_EVENT, "event_1")
+        assert feed.changes_since(1) == []
+
+    def test_subscribe_replays_from_sequence(self):
+        feed = ChangeFeed()
+        for index in range(3):
+            feed.publish(Change.ADD_EVENT, f"event_{index}")
+        received = []
+        feed.subscribe(received.append, from_sequence=1)
+        feed.publish(Change.DELETE_EVENT, "event_0")
+        assert [change.sequence for change in received] == [2, 3, 4]
+
+    def test_unsubscribe_stops_delivery(self):
+        feed = ChangeFeed()
+        received = []
+        feed.unsubscribe(feed.subscribe(received.append))
+        feed.publish(Change.ADD_EVENT, "event_1")
+        assert received == []
+
+    def test_failing_subscriber_does_not_stop_delivery(self, caplog):
+        feed = ChangeFeed()
+        received = []
+
+        def fail(change):
+            raise RuntimeError("subscriber failed")
+
+        feed.subscribe(fail)
+        feed.subscribe(received.append)
+        queue = feed.subscribe_queue()
+        feed.publish(Change.ADD_EVENT, "event_1")
+        feed.publish(Change.ADD_EVENT, "event_2")
+        assert [change.sequence for change in received] == [1, 2]
+        assert queue.qsize() == 2
+        assert "subscriber failed" in caplog.text
+        assert caplog.text.count("was unsubscribed") == 1
+
+    def test_full_queue_receives_overflow_marker(self):
+        async def consume():
+            feed = ChangeFeed()
+            queue = feed.subscribe_queue(maxsize=2)
+            for index in range(4):
+                feed.publish(Change.ADD_EVENT, f"event_{index}")
+            items = [await asyncio.wait_for(queue.get(), timeout=1) for _ in range(3)]
+            assert queue.empty()
+            # The consumer resumes where the marker tells it to
+            resumed = feed.subscribe_queue(from_sequence=items[-1].sequence)
+            return items, [resumed.get_nowait().sequence for _ in range(resumed.qsize())]
+
+        items, resumed = asyncio.run(consume())
+        assert [change.sequence for change in items[:2]] == [1, 2]
+        assert items[2] == QueueOverflow(2)
+        assert resumed == [3, 4]
+
+    def test_replay_larger_than_queue_overflows(self):
+        feed = ChangeFeed()
+        for index in range(3):
+            feed.publish(Change.ADD_EVENT, f"event_{index}")
+        queue = feed.subscribe_queue(from_sequence=0, maxsize=1)
+        feed.publish(Change.ADD_EVENT, "event_3")
+        assert [queue.get_nowait() for _ in range(queue.qsize())] == [feed.changes_since(0)[0], QueueOverflow(1)]
+
+
+class TestCalendarChanges:
+    def test_mutations_emit_changes(self, calendar):
+        event_id = add_event(calendar)
+        calendar.update_event(event_id, "New title", "New description", date(2024, 5, 1), time(11, 0), time(12, 0))
+        calendar.add_reminder(event_id, datetime(2024, 5, 1, 9, 0), Reminder.EMAIL)
+        calendar.delete_reminder(event_id, 0)
+        calendar.delete_event(event_id)
+        changes = calendar.changes.changes_since(0)
+        assert [change.operation for change in changes] == [Change.ADD_EVENT, Change.UPDATE_EVENT,
+                                                           Change.ADD_REMINDER, Change.DELETE_REMINDER,
+                                                           Change.DELETE_EVENT]
+        assert all(change.event_id == event_id for change in changes)
+        assert changes[2].reminder_index == 0
+
+    def test_failed_mutation_emits_nothing(self, calendar):
+        add_event(calendar)
+        with pytest.raises(ValueError):
+            add_event(calendar)
+        assert calendar.changes.last_sequence == 1
+
+    def test_snapshot_records_sequence(self, calendar):
+        add_event(calendar)
+        snapshot = calendar.snapshot()
+        add_event(calendar, hour=11)
+        assert snapshot.sequence == 1
+        assert len(calendar.changes.changes_since(snapshot.sequence)) == 1
+
+    def test_sequence_continues_after_pickling(self, calendar):
+        add_event(calendar)
+        calendar = pickle.loads(pickle.dumps(calendar))
+        add_event(calendar, hour=11)
+        assert calendar.changes.last_sequence == 2
+
+    def test_failing_subscriber_does_not_fail_the_write(self, calendar):
+        def fail(change):
+            raise RuntimeError("subscriber failed")
+
+        calendar.changes.subscribe(fail)
+        event_id = add_event(calendar)
+        assert event_id in calendar.events
+        assert calendar.changes.last_sequence == 1
+
+    def test_asyncio_queue_receives_changes(self, calendar):
+        async def consume():
+            queue = calendar.changes.subscribe_queue(from_sequence=0)
+            add_event(calendar)
+            return await asyncio.wait_for(queue.get(), timeout=1)
+
+        change = asyncio.run(consume())
+        assert change.operation == Change.ADD_EVENT
@@ -0,0 +1,112 @@
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.model.calendar import Calendar, ConflictReport, Day
+from app.services.util import SlotNotAvailableError
+
+FUTURE_DATE = date(2024, 6, 1)
+
+
+@pytest.fixture()
+def day_with_events():
+    day = Day(date(2024, 5, 1))
+    day.add_event("event_1", time(10, 0), time(11, 0))
+    day.add_event("event_2", time(11, 0), time(12, 0))
+    return day
+
+
+@pytest.fixture()
+def calendar_with_full_day():
+    calendar = Calendar()
+    calendar.add_event("Event 1", "Event 1 description", FUTURE_DATE, time(0, 0), time(12, 0))
+    calendar.add_event("Event 2", "Event 2 description", FUTURE_DATE, time(12, 0), time(23, 59))
+    return calendar
+
+
+class TestDayConflicts:
+    def test_find_conflicts_returns_all_conflicting_ids(self, day_with_events):
+        assert day_with_events.find_conflicts(time(10, 30), time(11, 30)) == ["event_1", "event_2"]
+
+    def test_find_conflicts_ignores_given_event(self, day_with_events):
+        assert day_with_events.find_conflicts(time(10, 30), time(11, 30), ignore_id="event_1") == ["event_2"]
+
+    def test_conflict_report_suggests_nearest_free_windows(self, day_with_events):
+        report = day_with_events.conflict_report(time(10, 30), time(11, 30))
+        assert report.event_ids == ["event_1", "event_2"]
+        assert report.alternatives[:2] == [(date(2024, 5, 1), time(9, 0), time(10, 0)),
+                                           (date(2024, 5, 1), time(12, 0), time(13, 0))]
+
+    def test_conflict_report_window_ending_at_midnight(self):
+        day = Day(date(2024, 5, 1))
+        day.add_event("event_1", time(0, 0), time(23, 0))
+        report = day.conflict_report(time(22, 0), time(23, 0))
+        assert report.alternatives == [(date(2024, 5, 1), time(23, 0), time(23, 59))]
+
+    def test_add_event_error_carries_report(self, day_with_events):
+        with pytest.raises(SlotNotAvailableError) as error:
+            day_with_events.add_event("event_3", time(11, 45), time(12, 15))
+        assert isinstance(error.value.report, ConflictReport)
+        assert error.value.report.event_ids == ["event_2"]
+
+    def test_update_event_conflict_leaves_slots_untouched(self, day_with_events):
+        slots_before = dict(day_with_events.slots)
+        with pytest.raises(ValueError):
+            day_with_events.update_event("event_1", time(9, 0), time(11, 15))
+        assert day_with_events.slots == slots_before
+
+    def test_update_event_moves_event(self, day_with_events):
+        day_with_events.update_event("event_1", time(9, 30), time(10, 30))
+        assert day_with_events.slots[time(9, 30)] == "event_1"
+        assert day_with_events.slots[time(10, 15)] == "event_1"
+        assert day_with_events.slots[time(10, 30)] is None
+
+
+class TestCalendarConflicts:
+    def test_check_conflicts_without_conflicts_is_empty(self, calendar_with_full_day):
+        report = calendar_with_full_day.check_conflicts(FUTURE_DATE + timedelta(days=1), time(10, 0), time(11, 0))
+        assert report.event_ids == []
+        assert report.alternatives == []
+
+    def test_check_conflicts_suggests_following_days(self, calendar_with_full_day):
+        report = calendar_with_full_day.check_conflicts(FUTURE_DATE, time(10, 0), time(11, 0))
+        assert len(report.event_ids) == 1
+        assert report.alternatives == [(FUTURE_DATE + timedelta(days=offset), time(10, 0), time(11, 0))
+                                       for offset in range(1, 4)]
+
+    def test_add_event_conflict_does_not_add_event(self, calendar_with_full_day):
+        with pytest.raises(SlotNotAvailableError) as error:
+            calendar_with_full_day.add_event("Event 3", "Event 3 description", FUTURE_DATE, time(11, 0), time(13, 0))
+        assert len(error.value.report.event_ids) == 2
+        assert len(calendar_with_full_day.events) == 2
+
+    def test_update_event_conflict_keeps_event(self, calendar_with_full_day):
+        event_id = next(iter(calendar_with_full_day.events))
+        with pytest.raises(SlotNotAvailableError):
+            calendar_with_full_day.update_event(event_id, "New title", "New description", FUTURE_DATE,
+                                                time(11, 0), time(13, 0))
+        assert calendar_with_full_day.events[event_id].title == "Event 1"
+        assert calendar_with_full_day.days[FUTURE_DATE].slots[time(11, 45)] == event_id
+
+    def test_check_conflicts_mixes_same_day_and_following_day(self):
+        calendar = Calendar()
+        calendar.add_event("Event 1", "Event 1 description", FUTURE_DATE, time(10, 0), time(11, 0))
+        report = calendar.check_conflicts(FUTURE_DATE, time(10, 0), time(11, 0))
+        assert report.alternatives == [(FUTURE_DATE, time(9, 0), time(10, 0)),
+                                       (FUTURE_DATE, time(11, 0), time(12, 0)),
+                                       (FUTURE_DATE + timedelta(days=1), time(10, 0), time(11, 0))]
+
+    def test_check_conflicts_falls_back_to_same_day_without_following_days(self):
+        calendar = Calendar()
+        calendar.add_event("Event 1", "Event 1 description", FUTURE_DATE, time(10, 0), time(11, 0))
+        report = calendar.check_conflicts(FUTURE_DATE, time(10, 0), time(11, 0), days_ahead=0)
+        assert report.alternatives == [(FUTURE_DATE, time(9, 0), time(10, 0)),
+                                       (FUTURE_DATE, time(11, 0), time(12, 0)),
+                                       (FUTURE_DATE, time(8, 45), time(9, 45))]
+
+    def test_add_event_without_conflict_skips_alternatives(self, monkeypatch):
+        calendar = Calendar()
+        calendar.add_event("Event 1", "Event 1 description", FUTURE_DATE, time(10, 0), time(11, 0))
+        monkeypatch.setattr(Calendar, "_find_alternatives", lambda *args: pytest.fail("alternatives were built"))
+        calendar.add_event("Event 2", "Event 2 description", FUTURE_DATE, time(11, 0), time(12, 0))
+        assert len(calendar.events) == 2
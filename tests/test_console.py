@@ -0,0 +1,81 @@
+import subprocess
+import sys
+
+import pytest
+
+from app.model.calendar import Calendar
+from app.services.persistence import PersistenceService
+from app.view.console import ConsoleView
+
+
+@pytest.fixture()
+def console_with_tmp_storage(tmp_path):
+    console = ConsoleView()
+    console._persistence_service = PersistenceService(str(tmp_path / "calendar.data"))
+    return console
+
+
+class TestConsoleStartup:
+    def test_console_view_does_not_load_calendar_on_construction(self):
+        assert not ConsoleView().calendar_loaded
+
+    def test_console_view_uses_given_calendar(self):
+        calendar = Calendar()
+        console = ConsoleView(calendar)
+        assert console.calendar_loaded
+        assert console.calendar is calendar
+
+    def test_importing_main_defers_heavy_modules(self):
+        code = ("import sys, app.main; "
+                "print(','.join(m for m in ('argparse', 'shlex', 'app.model.calendar') if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == ""
+
+    def test_save_calendar_skips_unloaded_calendar(self, console_with_tmp_storage, tmp_path):
+        console_with_tmp_storage.save_calendar()
+        assert not (tmp_path / "calendar.data").exists()
+
+    def test_run_once_saves_after_mutating_command(self, console_with_tmp_storage, tmp_path):
+        (tmp_path / "calendar.data").touch()
+        command = ["add_event", "Meeting", "Planning", "2024-05-02", "09:00", "10:00"]
+        assert console_with_tmp_storage.run_once(command) == 0
+        calendar = PersistenceService(str(tmp_path / "calendar.data")).load()
+        assert [event.title for event in calendar.events.values()] == ["Meeting"]
+
+    def test_run_once_fails_and_does_not_save_after_failed_command(self, console_with_tmp_storage, tmp_path):
+        (tmp_path / "calendar.data").touch()
+        assert console_with_tmp_storage.run_once(["delete_event", "abc12"]) == 1
+        assert (tmp_path / "calendar.data").stat().st_size == 0
+
+    def test_run_once_fails_on_conflict(self, console_with_tmp_storage, tmp_path):
+        (tmp_path / "calendar.data").touch()
+        command = ["add_event", "Meeting", "Planning", "2024-05-02", "09:00", "10:00"]
+        assert console_with_tmp_storage.run_once(command) == 0
+        assert console_with_tmp_storage.run_once(command) == 1
+        assert len(PersistenceService(str(tmp_path / "calendar.data")).load().events) == 1
+
+    def test_run_once_does_not_save_after_read_command(self, console_with_tmp_storage, tmp_path):
+        assert console_with_tmp_storage.run_once(["help"]) == 0
+        assert not (tmp_path / "calendar.data").exists()
+
+    def test_run_once_saves_after_profiled_mutating_command(self, console_with_tmp_storage, tmp_path):
+        (tmp_path / "calendar.data").touch()
+        command = ["profile", "add_event", "Meeting", "Planning", "2024-05-02", "09:00", "10:00"]
+        assert console_with_tmp_storage.run_once(command) == 0
+        calendar = PersistenceService(str(tmp_path / "calendar.data")).load()
+        assert [event.title for event in calendar.events.values()] == ["Meeting"]
+
+    def test_run_once_does_not_save_after_showing_time_zone(self, console_with_tmp_storage, tmp_path):
+        (tmp_path / "calendar.data").touch()
+        assert console_with_tmp_storage.run_once(["time_zone"]) == 0
+        assert (tmp_path / "calendar.data").stat().st_size == 0
+
+    def test_run_once_saves_after_changing_time_zone(self, console_with_tmp_storage, tmp_path):
+        (tmp_path / "calendar.data").touch()
+        assert console_with_tmp_storage.run_once(["time_zone", "America/Bogota"]) == 0
+        assert PersistenceService(str(tmp_path / "calendar.data")).load().time_zone == "America/Bogota"
+
+    def test_run_once_fails_on_invalid_archive_cutoff(self, console_with_tmp_storage, tmp_path):
+        (tmp_path / "calendar.data").touch()
+        assert console_with_tmp_storage.run_once(["archive", "2024-13-01"]) == 1
+        assert (tmp_path / "calendar.data").stat().st_size == 0
@@ -0,0 +1,54 @@
+import json
+from datetime import date
+
+import pytest
+
+from app.model.calendar import Calendar
+from app.services.instrumentation import Instrumentation, instrumented, stats
+
+
+@pytest.fixture()
+def enabled_stats():
+    stats.reset()
+    stats.enabled = True
+    yield stats
+    stats.enabled = False
+    stats.reset()
+
+
+class TestInstrumentation:
+    def test_disabled_instrumentation_records_nothing(self):
+        stats.reset()
+        Calendar().find_events(date(2024, 5, 1), date(2024, 5, 2))
+        assert stats.operations == {}
+
+    def test_enabled_instrumentation_records_calls(self, enabled_stats):
+        calendar = Calendar()
+        calendar.find_events(date(2024, 5, 1), date(2024, 5, 2))
+        calendar.find_events(date(2024, 5, 1), date(2024, 5, 2))
+        operation = enabled_stats.operations["calendar.find_events"]
+        assert operation.calls == 2
+        assert operation.errors == 0
+        assert sum(operation.histogram) == 2
+
+    def test_enabled_instrumentation_records_errors(self, enabled_stats):
+        with pytest.raises(ValueError):
+            Calendar().delete_event("event_id_not_found")
+        assert enabled_stats.operations["calendar.delete_event"].errors == 1
+
+    def test_instrumented_preserves_function_metadata(self):
+        @instrumented("test.operation")
+        def operation():
+            return 42
+
+        assert operation.__name__ == "operation"
+        assert operation() == 42
+
+    def test_to_json_includes_operations_and_objects(self):
+        instrumentation = Instrumentation(enabled=True)
+        instrumentation.record("test.operation", 2_000)
+        instrumentation.count_objects(Calendar())
+        data = json.loads(instrumentation.to_json())
+        assert data["operations"]["test.operation"]["calls"] == 1
+        assert data["operations"]["test.operation"]["histogram"]["<=10us"] == 1
+        assert data["objects"] == {"days": 0, "events": 0, "reminders": 0}
@@ -0,0 +1,374 @@
+import os
+import random
+import time as clock
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import app.model.calendar
+from app.model.calendar import Calendar, Day, Reminder
+from app.services.archive import ArchiveService
+from app.services.util import SlotNotAvailableError
+
+# Matches the date pinned by conftest.py
+TODAY = date(2024, 5, 1)
+# Set CALENDAR_SCALE_TESTS=1 for more seeds and the 100k operation run
+SCALE_TESTS = os.environ.get("CALENDAR_SCALE_TESTS", "") not in ("", "0")
+SLOTS = [time(hour, minute) for hour in range(24) for minute in range(0, 60, 15)]
+
+
+def slots_between(start_at: time, end_at: time) -> frozenset[time]:
+    return frozenset(slot for slot in SLOTS if start_at <= slot < end_at)
+
+
+def random_range(rng: random.Random) -> tuple[time, time]:
+    # Mostly slot aligned, sometimes off the grid, often close to midnight
+    hour = rng.choice([rng.randrange(24), 23, 23, 0])
+    minute = rng.choice([0, 15, 30, 45, 0, 15, 30, 45, rng.randrange(60)])
+    start_at = time(hour, minute)
+    end_minutes = hour * 60 + minute + rng.choice([15, 30, 45, 60, 90, 120, 240, rng.randrange(-30, 600)])
+    end_at = time(23, 59) if end_minutes >= 24 * 60 else time(*divmod(max(end_minutes, 0), 60))
+    return start_at, end_at
+
+
+class ReferenceDay:
+    # Oracle for Day: the set of slots each event id holds
+    def __init__(self):
+        self.events: dict[str, frozenset[time]] = {}
+
+    def conflicts(self, slots: frozenset[time], ignore_id: str | None = None) -> set[str]:
+        return {event_id for event_id, booked in self.events.items() if event_id != ignore_id and booked & slots}
+
+    def occupancy(self) -> dict[time, str | None]:
+        slots: dict[time, str | None] = dict.fromkeys(SLOTS)
+        for event_id, booked in self.events.items():
+            for slot in booked:
+                slots[slot] = event_id
+        return slots
+
+
+def utc_slots(start: datetime, end: datetime) -> frozenset[tuple[date, time]]:
+    # (UTC date, slot) pairs of every slot starting in [start, end)
+    minutes = start.minute + (1 if start.second or start.microsecond else 0)
+    slot = start.replace(second=0, microsecond=0) + timedelta(minutes=-start.minute - (-minutes // 15) * 15)
+    slots = set()
+    while slot < end:
+        slots.add((slot.date(), slot.time()))
+        slot += timedelta(minutes=15)
+    return frozenset(slots)
+
+
+class ReferenceEvent:
+    def __init__(self, start: datetime, end: datetime):
+        self.start: datetime = start
+        self.end: datetime = end
+        self.slots: frozenset[tuple[date, time]] = utc_slots(start, end)
+        self.reminders: int = 0
+
+
+class ReferenceCalendar:
+    # Oracle for a Calendar in any zone, built on zoneinfo directly and indexed by UTC date to stay cheap at 100k
+    # operations
+    def __init__(self, time_zone: str):
+        self.zone: ZoneInfo = ZoneInfo(time_zone)
+        self.events: dict[str, ReferenceEvent] = {}
+        self.archived: dict[str, ReferenceEvent] = {}
+        self.archived_before: date | None = None
+        self.by_date: dict[date, set[str]] = {}
+
+    def to_utc(self, date_: date, time_: time) -> datetime:
+        return datetime.combine(date_, time_, tzinfo=self.zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+    def conflicts(self, start: datetime, end: datetime, ignore_id: str | None = None) -> set[str]:
+        slots = utc_slots(start, end)
+        dates = {date_ for date_, _ in slots}
+        return {event_id for date_ in dates for event_id in self.by_date.get(date_, ())
+                if event_id != ignore_id and self.events[event_id].slots & slots}
+
+    def add(self, event_id: str, start: datetime, end: datetime):
+        event = self.events[event_id] = ReferenceEvent(start, end)
+        for date_, _ in event.slots:
+            self.by_date.setdefault(date_, set()).add(event_id)
+
+    def delete(self, event_id: str) -> ReferenceEvent:
+        event = self.events.pop(event_id)
+        for date_, _ in event.slots:
+            self.by_date[date_].discard(event_id)
+        return event
+
+    def archive_before(self, cutoff: date):
+        for event_id in [event_id for event_id, event in self.events.items() if event.end.date() < cutoff]:
+            self.archived[event_id] = self.delete(event_id)
+        self.archived_before = cutoff
+
+    def free_slots(self, date_: date) -> list[time]:
+        # Slots of the wall-clock day, including those booked by archived events
+        start, end = self.to_utc(date_, time(0)), self.to_utc(date_ + timedelta(days=1), time(0))
+        booked = set()
+        for event in (*self.events.values(), *self.archived.values()):
+            if event.start < end and start < event.end:
+                booked |= event.slots
+        free = []
+        slot = start
+        while slot < end:
+            if (slot.date(), slot.time()) not in booked:
+                free.append(slot.replace(tzinfo=timezone.utc).astimezone(self.zone).time())
+            slot += timedelta(minutes=15)
+        return free
+
+
+class CalendarHarness:
+    def __init__(self, seed: int, dates: int = 14, time_zone: str = "UTC", first_date: date = TODAY - timedelta(days=1),
+                 archive: ArchiveService | None = None, set_today: Callable[[date], None] | None = None,
+                 whole_days: float = 0.05):
+        self.rng: random.Random = random.Random(seed)
+        self.calendar: Calendar = Calendar(time_zone)
+        self.reference: ReferenceCalendar = ReferenceCalendar(time_zone)
+        self.dates: list[date] = [first_date + timedelta(days=offset) for offset in range(dates + 1)]
+        self.archive: ArchiveService | None = archive
+        # Moves the date the calendar takes as today, which archive_past advances
+        self.set_today: Callable[[date], None] | None = set_today
+        self.today: date = TODAY
+        # Share of bookings spanning nearly a whole local day
+        self.whole_days: float = whole_days
+        self.mutations: int = 0
+
+    def random_event_id(self) -> str:
+        if self.reference.events and self.rng.random() < 0.9:
+            return self.rng.choice(list(self.reference.events))
+        return "missing"
+
+    def step(self):
+        operation = self.rng.choices(["add", "update", "delete", "add_reminder", "delete_reminder"],
+                                     weights=[5, 3, 2, 1, 1])[0]
+        getattr(self, operation)()
+
+    def random_booking(self) -> tuple[date, time, time, datetime, datetime]:
+        date_ = self.rng.choice(self.dates)
+        if self.rng.random() < self.whole_days:
+            # Nearly whole days, which last over 24 hours in UTC on a fall-back day
+            start_at, end_at = time(0, self.rng.choice([0, 15])), time(23, self.rng.choice([30, 45, 59]))
+        else:
+            start_at, end_at = random_range(self.rng)
+        return date_, start_at, end_at, self.reference.to_utc(date_, start_at), self.reference.to_utc(date_, end_at)
+
+    def rejected(self, start: datetime, end: datetime) -> bool:
+        archived_before = self.reference.archived_before
+        return end <= start or (archived_before is not None and start.date() < archived_before)
+
+    def add(self):
+        date_, start_at, end_at, start, end = self.random_booking()
+        if date_ < self.today or self.rejected(start, end):
+            with pytest.raises(ValueError):
+                self.calendar.add_event("Event", "Description", date_, start_at, end_at)
+        elif conflicts := self.reference.conflicts(start, end):
+            with pytest.raises(SlotNotAvailableError) as error:
+                self.calendar.add_event("Event", "Description", date_, start_at, end_at)
+            assert set(error.value.report.event_ids) == conflicts
+        else:
+            event_id = self.calendar.add_event("Event", "Description", date_, start_at, end_at)
+            assert event_id not in self.reference.events and event_id not in self.reference.archived
+            self.reference.add(event_id, start, end)
+            self.mutations += 1
+
+    def update(self):
+        event_id = self.random_event_id()
+        date_, start_at, end_at, start, end = self.random_booking()
+        if event_id not in self.reference.events or self.rejected(start, end):
+            with pytest.raises(ValueError):
+                self.calendar.update_event(event_id, "Updated", "Description", date_, start_at, end_at)
+        elif self.reference.conflicts(start, end, ignore_id=event_id):
+            with pytest.raises(SlotNotAvailableError):
+                self.calendar.update_event(event_id, "Updated", "Description", date_, start_at, end_at)
+        else:
+            self.calendar.update_event(event_id, "Updated", "Description", date_, start_at, end_at)
+            reminders = self.reference.delete(event_id).reminders
+            self.reference.add(event_id, start, end)
+            self.reference.events[event_id].reminders = reminders
+            self.mutations += 1
+
+    def delete(self):
+        event_id = self.random_event_id()
+        if event_id not in self.reference.events:
+            with pytest.raises(ValueError):
+                self.calendar.delete_event(event_id)
+        else:
+            self.calendar.delete_event(event_id)
+            self.reference.delete(event_id)
+            self.mutations += 1
+
+    def add_reminder(self):
+        event_id = self.random_event_id()
+        if event_id not in self.reference.events:
+            with pytest.raises(ValueError):
+                self.calendar.add_reminder(event_id, datetime(2024, 5, 1, 9, 0), Reminder.EMAIL)
+        else:
+            self.calendar.add_reminder(event_id, datetime(2024, 5, 1, 9, 0), Reminder.EMAIL)
+            self.reference.events[event_id].reminders += 1
+            self.mutations += 1
+
+    def delete_reminder(self):
+        event_id = self.random_event_id()
+        index = self.rng.randrange(-1, 3)
+        if event_id not in self.reference.events or not 0 <= index < self.reference.events[event_id].reminders:
+            with pytest.raises(ValueError):
+                self.calendar.delete_reminder(event_id, index)
+        else:
+            self.calendar.delete_reminder(event_id, index)
+            self.reference.events[event_id].reminders -= 1
+            self.mutations += 1
+
+    def archive_past(self):
+        # A day goes by and everything that ended before the new today is archived
+        self.today += timedelta(days=1)
+        self.set_today(self.today)
+        self.calendar.archive_before(self.today, self.archive)
+        self.reference.archive_before(self.today)
+
+    def check_invariants(self):
+        calendar, reference = self.calendar, self.reference
+        # The events dict agrees with the oracle
+        assert calendar.events.keys() == reference.events.keys()
+        for event_id, expected in reference.events.items():
+            event = calendar.events[event_id]
+            assert (event.date_, event.start_at, event.end_date, event.end_at) == \
+                   (expected.start.date(), expected.start.time(), expected.end.date(), expected.end.time())
+            assert len(event.reminders) == expected.reminders
+
+        # Every booked slot belongs to an event covering it, and every hot event holds exactly its slots. Hot days
+        # before the archive cutoff can still hold slots of archived events
+        booked: dict[str, set[tuple[date, time]]] = {}
+        for date_, day in calendar.days.items():
+            assert len(day.slots) == len(SLOTS)
+            for slot, event_id in day.slots.items():
+                if event_id is not None:
+                    expected = reference.events.get(event_id) or reference.archived[event_id]
+                    assert (date_, slot) in expected.slots
+                    booked.setdefault(event_id, set()).add((date_, slot))
+        for event_id, expected in reference.events.items():
+            assert booked.get(event_id, set()) == expected.slots
+
+        date_ = self.rng.choice(self.dates)
+        assert calendar.find_available_slots(date_) == reference.free_slots(date_)
+        found = calendar.find_events(self.dates[0], self.dates[-1])
+        assert {event.id for events in found.values() for event in events} == \
+               reference.events.keys() | reference.archived.keys()
+        assert calendar.changes.last_sequence == self.mutations
+
+    def run(self, operations: int, check_every: int = 100, archive_every: int = 500):
+        for index in range(1, operations + 1):
+            self.step()
+            if self.archive and index % archive_every == 0:
+                self.archive_past()
+            if index % check_every == 0:
+                self.check_invariants()
+        self.check_invariants()
+
+
+class DayHarness:
+    def __init__(self, seed: int):
+        self.rng: random.Random = random.Random(seed)
+        self.day: Day = Day(TODAY)
+        self.reference: ReferenceDay = ReferenceDay()
+
+    def step(self):
+        event_id = f"event_{self.rng.randrange(12)}"
+        start_at, end_at = random_range(self.rng)
+        slots = slots_between(start_at, end_at)
+        operation = self.rng.choice(["add", "update", "delete"])
+        if operation == "delete":
+            if self.reference.events.get(event_id):
+                self.day.delete_event(event_id)
+                del self.reference.events[event_id]
+            else:
+                with pytest.raises(ValueError):
+                    self.day.delete_event(event_id)
+            return
+
+        # add_event never checks for the id itself, so a second booking of a live id only happens through update
+        if operation == "add" and event_id in self.reference.events:
+            return
+        ignore_id = event_id if operation == "update" else None
+        if self.reference.conflicts(slots, ignore_id):
+            with pytest.raises(SlotNotAvailableError):
+                getattr(self.day, f"{operation}_event")(event_id, start_at, end_at)
+        else:
+            getattr(self.day, f"{operation}_event")(event_id, start_at, end_at)
+            self.reference.events[event_id] = slots
+
+    def run(self, operations: int):
+        for _ in range(operations):
+            self.step()
+            # The oracle only changes on success, so this also checks that failed operations write nothing
+            assert self.day.slots == self.reference.occupancy()
+
+
+class TestDaySlotEngine:
+    @pytest.mark.parametrize("seed", range(20 if SCALE_TESTS else 5))
+    def test_random_day_operations_match_reference(self, seed):
+        DayHarness(seed).run(2_000)
+
+    def test_slots_between_reaches_the_last_slot(self):
+        assert Day.slots_between(time(23, 30), time.max) == (time(23, 30), time(23, 45))
+        assert Day.slots_between(time(10, 5), time(10, 31)) == (time(10, 15), time(10, 30))
+        assert Day.slots_between(time(0, 0), time.max) == tuple(SLOTS)
+
+
+class TestCalendarModelChecking:
+    @pytest.mark.parametrize("seed", range(10 if SCALE_TESTS else 3))
+    def test_random_operation_sequences_match_reference(self, seed):
+        CalendarHarness(seed).run(2_000)
+
+    @pytest.mark.parametrize("seed", range(5 if SCALE_TESTS else 2))
+    @pytest.mark.parametrize(
+        "time_zone, first_date",
+        [("America/New_York", date(2024, 11, 1)), ("Europe/Madrid", date(2024, 10, 25)),
+         ("Asia/Kolkata", date(2024, 5, 1))]
+    )
+    def test_random_operations_in_time_zone_match_reference(self, seed, time_zone, first_date):
+        # The New York and Madrid weeks hold a fall-back day, whose whole-day bookings last over 24 hours in UTC.
+        # Kolkata events often cross UTC midnight
+        CalendarHarness(seed, dates=6, time_zone=time_zone, first_date=first_date, whole_days=0.2).run(2_000)
+
+    @pytest.mark.parametrize("seed", range(5 if SCALE_TESTS else 3))
+    @pytest.mark.parametrize("time_zone", ["UTC", "Asia/Tokyo"])
+    def test_random_operations_with_archive_match_reference(self, seed, time_zone, tmp_path, monkeypatch):
+        # A week of past dates for updates to move events onto before they are archived
+        harness = CalendarHarness(seed, time_zone=time_zone, first_date=TODAY - timedelta(days=7),
+                                  archive=ArchiveService(str(tmp_path)),
+                                  set_today=lambda today: monkeypatch.setattr(app.model.calendar, "current_date",
+                                                                              lambda: today))
+        harness.run(2_000)
+        assert harness.reference.archived
+
+    def test_snapshot_stays_consistent_during_random_writes(self):
+        harness = CalendarHarness(seed=99)
+        harness.run(1_000)
+        snapshot = harness.calendar.snapshot()
+        expected = {event_id: (event.date_, event.start_at, event.end_at, len(event.reminders))
+                    for event_id, event in harness.calendar.events.items()}
+        expected_slots = {date_: dict(day.slots) for date_, day in harness.calendar.days.items()}
+        harness.run(1_000)
+        assert {event_id: (event.date_, event.start_at, event.end_at, len(event.reminders))
+                for event_id, event in snapshot.events.items()} == expected
+        assert {date_: dict(day.slots) for date_, day in snapshot.days.items()} == expected_slots
+
+    def test_add_event_regenerates_colliding_ids(self, monkeypatch):
+        ids = iter(["abc12", "abc12", "def34"])
+        monkeypatch.setattr(app.model.calendar, "generate_unique_id", lambda: next(ids))
+        calendar = Calendar()
+        first = calendar.add_event("Event 1", "Description", TODAY, time(10, 0), time(11, 0))
+        second = calendar.add_event("Event 2", "Description", TODAY, time(12, 0), time(13, 0))
+        assert (first, second) == ("abc12", "def34")
+        assert calendar.events[first].title == "Event 1"
+
+    @pytest.mark.skipif(not SCALE_TESTS, reason="Set CALENDAR_SCALE_TESTS=1 to run the scale tests")
+    def test_scale_100k_operations(self):
+        harness = CalendarHarness(seed=2024, dates=60)
+        start = clock.perf_counter()
+        harness.run(100_000, check_every=10_000)
+        elapsed = clock.perf_counter() - start
+        # A generous ceiling that still catches an accidental O(n) per operation
+        assert elapsed < 120, f"100k operations took {elapsed:.1f}s"
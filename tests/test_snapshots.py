@@ -0,0 +1,70 @@
+import pickle
+from datetime import date, datetime, time
+
+import pytest
+
+from app.model.calendar import Calendar, CalendarSnapshot, Reminder
+
+
+@pytest.fixture()
+def calendar_with_events():
+    calendar = Calendar()
+    calendar.add_event("Event 1", "Event 1 description", date(2024, 5, 1), time(10, 0), time(11, 0))
+    calendar.add_event("Event 2", "Event 2 description", date(2024, 5, 2), time(10, 0), time(11, 0))
+    return calendar
+
+
+def event_id_by_title(calendar, title):
+    return next(event_id for event_id, event in calendar.events.items() if event.title == title)
+
+
+class TestCalendarSnapshot:
+    def test_snapshot_is_read_only(self, calendar_with_events):
+        snapshot = calendar_with_events.snapshot()
+        assert isinstance(snapshot, CalendarSnapshot)
+        with pytest.raises(TypeError):
+            snapshot.events["new_id"] = None
+
+    def test_snapshot_does_not_see_later_add_event(self, calendar_with_events):
+        snapshot = calendar_with_events.snapshot()
+        calendar_with_events.add_event("Event 3", "Event 3 description", date(2024, 5, 1), time(12, 0), time(13, 0))
+        assert len(snapshot.events) == 2
+        assert len(snapshot.find_available_slots(date(2024, 5, 1))) == 92
+        assert len(calendar_with_events.find_available_slots(date(2024, 5, 1))) == 88
+
+    def test_snapshot_does_not_see_later_update_event(self, calendar_with_events):
+        event_id = event_id_by_title(calendar_with_events, "Event 1")
+        snapshot = calendar_with_events.snapshot()
+        calendar_with_events.update_event(event_id, "New title", "New description", date(2024, 5, 3),
+                                          time(9, 0), time(9, 30))
+        assert snapshot.events[event_id].title == "Event 1"
+        assert snapshot.days[date(2024, 5, 1)].slots[time(10, 0)] == event_id
+        assert date(2024, 5, 3) not in snapshot.days
+        assert calendar_with_events.days[date(2024, 5, 1)].slots[time(10, 0)] is None
+        assert calendar_with_events.days[date(2024, 5, 3)].slots[time(9, 0)] == event_id
+
+    def test_snapshot_does_not_see_later_delete_event(self, calendar_with_events):
+        event_id = event_id_by_title(calendar_with_events, "Event 1")
+        snapshot = calendar_with_events.snapshot()
+        calendar_with_events.delete_event(event_id)
+        assert event_id in snapshot.events
+        assert snapshot.find_events(date(2024, 5, 1), date(2024, 5, 1))[date(2024, 5, 1)][0].id == event_id
+
+    def test_snapshot_does_not_see_later_reminders(self, calendar_with_events):
+        event_id = event_id_by_title(calendar_with_events, "Event 1")
+        snapshot = calendar_with_events.snapshot()
+        calendar_with_events.add_reminder(event_id, datetime(2024, 5, 1, 9, 0), Reminder.EMAIL)
+        assert snapshot.list_reminders(event_id) == []
+        assert len(calendar_with_events.list_reminders(event_id)) == 1
+
+    def test_writes_copy_only_touched_objects(self, calendar_with_events):
+        snapshot = calendar_with_events.snapshot()
+        calendar_with_events.add_event("Event 3", "Event 3 description", date(2024, 5, 1), time(12, 0), time(13, 0))
+        assert calendar_with_events.days[date(2024, 5, 1)] is not snapshot.days[date(2024, 5, 1)]
+        assert calendar_with_events.days[date(2024, 5, 2)] is snapshot.days[date(2024, 5, 2)]
+
+    def test_pickled_calendar_drops_copy_on_write_state(self, calendar_with_events):
+        calendar_with_events.snapshot()
+        calendar = pickle.loads(pickle.dumps(calendar_with_events))
+        assert not calendar._copy_on_write
+        assert calendar.events.keys() == calendar_with_events.events.keys()
@@ -0,0 +1,128 @@
+import pickle
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from app.model.calendar import Calendar, Event, Reminder
+from app.services.timezones import local_day_slots, to_local, to_utc, utc_offsets
+from app.services.util import SlotNotAvailableError
+
+
+class TestTimeZoneConversions:
+    def test_to_utc_and_back(self):
+        utc = to_utc("America/Bogota", date(2024, 5, 1), time(20, 0))
+        assert utc == datetime(2024, 5, 2, 1, 0)
+        assert to_local("America/Bogota", utc.date(), utc.time()) == datetime(2024, 5, 1, 20, 0)
+
+    def test_utc_offsets_locate_dst_transition(self):
+        offsets = utc_offsets("America/New_York", date(2024, 3, 10))
+        assert offsets == ((time(0, 0), timedelta(hours=-5)), (time(7, 0), timedelta(hours=-4)))
+
+    def test_utc_offsets_are_cached_per_zone_day(self):
+        utc_offsets.cache_clear()
+        for hour in range(24):
+            to_local("Europe/Madrid", date(2024, 10, 27), time(hour, 0))
+        assert utc_offsets.cache_info().misses == 1
+
+    @pytest.mark.parametrize(
+        "local_date, expected_slots",
+        [(date(2024, 3, 10), 92), (date(2024, 11, 3), 100), (date(2024, 5, 1), 96)]
+    )
+    def test_local_day_slots_follow_dst(self, local_date, expected_slots):
+        assert len(local_day_slots("America/New_York", local_date)) == expected_slots
+
+    def test_unknown_time_zone_raises_value_error(self):
+        with pytest.raises(ValueError):
+            to_utc("Mars/Olympus_Mons", date(2024, 5, 1), time(10, 0))
+
+
+@pytest.fixture()
+def bogota_calendar():
+    return Calendar("America/Bogota")
+
+
+class TestCalendarTimeZones:
+    def test_events_are_stored_in_utc(self, bogota_calendar):
+        event_id = bogota_calendar.add_event("Event 1", "Event 1 description", date(2024, 5, 1), time(10, 0),
+                                             time(11, 0))
+        event = bogota_calendar.events[event_id]
+        assert (event.date_, event.start_at, event.end_at) == (date(2024, 5, 1), time(15, 0), time(16, 0))
+        assert event.time_zone == "America/Bogota"
+
+    def test_find_events_answers_in_callers_zone(self, bogota_calendar):
+        event_id = bogota_calendar.add_event("Event 1", "Event 1 description", date(2024, 5, 1), time(20, 0),
+                                             time(21, 0))
+        local_events = bogota_calendar.find_events(date(2024, 5, 1), date(2024, 5, 1))
+        assert local_events[date(2024, 5, 1)][0].start_at == time(20, 0)
+        utc_events = bogota_calendar.find_events(date(2024, 5, 2), date(2024, 5, 2), "UTC")
+        assert utc_events[date(2024, 5, 2)][0].id == event_id
+        assert utc_events[date(2024, 5, 2)][0].start_at == time(1, 0)
+
+    def test_event_crossing_utc_midnight_books_both_days(self, bogota_calendar):
+        event_id = bogota_calendar.add_event("Event 1", "Event 1 description", date(2024, 5, 1), time(18, 0),
+                                             time(20, 0))
+        assert bogota_calendar.days[date(2024, 5, 1)].slots[time(23, 45)] == event_id
+        assert bogota_calendar.days[date(2024, 5, 2)].slots[time(0, 45)] == event_id
+        assert len(bogota_calendar.find_available_slots(date(2024, 5, 1))) == 88
+
+        bogota_calendar.delete_event(event_id)
+        assert event_id not in bogota_calendar.days[date(2024, 5, 1)].slots.values()
+        assert event_id not in bogota_calendar.days[date(2024, 5, 2)].slots.values()
+
+    def test_conflicts_are_detected_across_zones(self, bogota_calendar):
+        bogota_calendar.add_event("Event 1", "Event 1 description", date(2024, 5, 1), time(10, 0), time(11, 0))
+        with pytest.raises(ValueError):
+            bogota_calendar.add_event("Event 2", "Event 2 description", date(2024, 5, 1), time(15, 30),
+                                      time(16, 30), "UTC")
+
+    def test_find_available_slots_on_dst_day(self):
+        calendar = Calendar("America/New_York")
+        calendar.add_event("Event 1", "Event 1 description", date(2024, 11, 3), time(0, 0), time(1, 0))
+        slots = calendar.find_available_slots(date(2024, 11, 3))
+        assert len(slots) == 96
+        assert slots.count(time(1, 0)) == 2
+
+    def test_full_fall_back_day_books_every_utc_day(self):
+        calendar = Calendar("America/New_York")
+        event_id = calendar.add_event("All day", "", date(2024, 11, 3), time(0, 0), time(23, 30))
+        event = calendar.events[event_id]
+        assert (event.date_, event.start_at) == (date(2024, 11, 3), time(4, 0))
+        assert (event.end_date, event.end_at) == (date(2024, 11, 4), time(4, 30))
+        local_event = calendar.find_events(date(2024, 11, 3), date(2024, 11, 3))[date(2024, 11, 3)][0]
+        assert (local_event.start_at, local_event.end_at) == (time(0, 0), time(23, 30))
+        assert calendar.find_available_slots(date(2024, 11, 3)) == [time(23, 30), time(23, 45)]
+        with pytest.raises(SlotNotAvailableError) as error:
+            calendar.add_event("Lunch", "", date(2024, 11, 3), time(12, 0), time(13, 0))
+        assert error.value.report.event_ids == [event_id]
+
+    def test_event_longer_than_a_day_survives_pickling(self):
+        calendar = Calendar("America/New_York")
+        event_id = calendar.add_event("All day", "", date(2024, 11, 3), time(0, 0), time(23, 30))
+        calendar = pickle.loads(pickle.dumps(calendar))
+        assert calendar.events[event_id].end_date == date(2024, 11, 4)
+        calendar.delete_event(event_id)
+        assert not any(day.find_conflicts(time(0, 0), time.max) for day in calendar.days.values())
+
+    def test_events_pickled_without_end_date_run_past_midnight(self):
+        event = Event("Event 1", "Event 1 description", date(2024, 5, 1), time(23, 0), time(1, 0))
+        state = dict(event.__dict__)
+        del state["end_date"]
+        restored = Event.__new__(Event)
+        restored.__setstate__(state)
+        assert restored.end_date == date(2024, 5, 2)
+
+    def test_reminders_are_converted(self, bogota_calendar):
+        event_id = bogota_calendar.add_event("Event 1", "Event 1 description", date(2024, 5, 1), time(10, 0),
+                                             time(11, 0))
+        bogota_calendar.add_reminder(event_id, datetime(2024, 5, 1, 9, 0), Reminder.EMAIL)
+        assert bogota_calendar.events[event_id].reminders[0].date_time == datetime(2024, 5, 1, 14, 0)
+        assert bogota_calendar.list_reminders(event_id)[0].date_time == datetime(2024, 5, 1, 9, 0)
+
+    def test_end_before_start_is_rejected(self, bogota_calendar):
+        with pytest.raises(ValueError):
+            bogota_calendar.add_event("Event 1", "Event 1 description", date(2024, 5, 1), time(11, 0), time(10, 0))
+
+    def test_set_time_zone_rejects_unknown_zone(self, bogota_calendar):
+        with pytest.raises(ValueError):
+            bogota_calendar.set_time_zone("Mars/Olympus_Mons")
+        assert bogota_calendar.time_zone == "America/Bogota"